@@ -15,7 +15,8 @@ from datetime import datetime
 from config import GenAIProvider, get_settings, get_available_providers
 from config.prompts import get_system_prompt
 from core.genai_manager import GenAIManager, ChatMessage
-from core.fastmcp_client import get_mcp_client
+from core.fastmcp_client import get_mcp_client, close_shared_http_client
+from core.mcp_client import FleetPulseMCPClient
 from core.conversation import ConversationManager
 
 # UI imports
@@ -33,6 +34,7 @@ from ui.dashboard import FleetDashboard, run_dashboard_async
 from utils.helpers import setup_logging, generate_conversation_title, format_timestamp
 from utils.validators import sanitize_input, validate_mcp_tool_parameters, ValidationError
 from utils.mcp_diagnostics import MCPDiagnosticRunner
+from utils.event_loop import install_uvloop
 
 
 # Configure Streamlit page
@@ -581,6 +583,10 @@ class FleetPulseChatbot:
                     loop = asyncio.new_event_loop()
                     asyncio.set_event_loop(loop)
                     response = loop.run_until_complete(self._process_chat_message(user_input))
+                    if self.genai_manager:
+                        loop.run_until_complete(self.genai_manager.aclose())
+                    loop.run_until_complete(close_shared_http_client())
+                    loop.run_until_complete(FleetPulseMCPClient.aclose_shared_http_client())
                     loop.close()
                     
                     # Display response
@@ -792,6 +798,8 @@ class FleetPulseChatbot:
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
             loop.run_until_complete(self._async_initialize_components())
+            loop.run_until_complete(close_shared_http_client())
+            loop.run_until_complete(FleetPulseMCPClient.aclose_shared_http_client())
             loop.close()
             # Render sidebar
             self._render_sidebar()
@@ -808,6 +816,9 @@ class FleetPulseChatbot:
 def main():
     """Main application entry point."""
     try:
+        # Per-operation event loops created from here on use uvloop when installed
+        install_uvloop()
+        
         # Initialize and run chatbot
         chatbot = FleetPulseChatbot()
         chatbot.run()
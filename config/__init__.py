@@ -22,6 +22,18 @@ class MCPConnectionType(str, Enum):
     WEBSOCKET = "websocket"
 
 
+class MCPWireFormat(str, Enum):
+    """Supported MCP message encodings."""
+    JSON = "json"
+    MSGPACK = "msgpack"
+
+
+class FleetPulseHTTPBackend(str, Enum):
+    """Supported HTTP clients for the FleetPulse REST API."""
+    HTTPX = "httpx"
+    AIOHTTP = "aiohttp"
+
+
 class Settings(BaseSettings):
     """Application settings with environment variable support."""
     
@@ -44,6 +56,8 @@ class Settings(BaseSettings):
     
     # FleetPulse Integration
     fleetpulse_api_url: str = "http://localhost:8000"
+    fleetpulse_http_backend: FleetPulseHTTPBackend = FleetPulseHTTPBackend.HTTPX
+    fleetpulse_tool_timeout: float = 30.0  # seconds, for a whole tool call
     fleetpulse_mcp_server: str = "./fleetpulse-mcp"
     
     # MCP Configuration
@@ -52,6 +66,9 @@ class Settings(BaseSettings):
     mcp_server_command: Optional[str] = None
     mcp_timeout: int = 30
     mcp_max_retries: int = 3
+    mcp_ws_compression: bool = False
+    mcp_wire_format: MCPWireFormat = MCPWireFormat.JSON
+    mcp_batch_requests: bool = False
     
     # Application Configuration
     streamlit_server_port: int = 8501
@@ -68,8 +85,28 @@ class Settings(BaseSettings):
     redis_url: Optional[str] = None
     enable_experimental_features: bool = False
     
+    # LLM Response Cache
+    llm_cache_enabled: bool = False  # only temperature-0 requests are cached
+    llm_cache_backend: str = "memory"  # memory or redis (uses redis_url)
+    llm_cache_max_entries: int = 512
+    llm_cache_ttl: int = 3600
+    llm_semantic_cache: bool = False
+    llm_cache_similarity_threshold: float = 0.95
+    llm_cache_exclude_patterns: List[str] = [
+        r"\b(current|right now|today|tonight|yesterday|tomorrow)\b",
+        r"\bwhat time\b",
+    ]
+    
     # Rate Limiting
-    rate_limit_requests_per_minute: int = 60
+    rate_limit_requests_per_minute: int = 60  # per GenAI provider; 0 disables
+    genai_max_concurrent_requests: int = 8  # per GenAI provider
+    genai_retry_attempts: int = 4  # including the first try
+    genai_request_timeout: float = 60.0  # seconds per non-streaming request
+    genai_stream_timeout: float = 30.0  # max seconds between streamed chunks
+    genai_coalesce_requests: bool = False
+    genai_fallback_chain: List[GenAIProvider] = []  # tried in order when the chosen provider fails
+    genai_breaker_threshold: int = 5  # consecutive failures before a provider is skipped
+    genai_breaker_cooldown: float = 30.0  # seconds before a skipped provider is tried again
     
     # Model Defaults
     default_temperature: float = 0.7
@@ -7,6 +7,7 @@ using keyword analysis, semantic understanding, and context awareness.
 
 import logging
 import re
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
@@ -31,6 +32,56 @@ class ExpertMatch:
     reasoning: str
     keywords_matched: List[str]
     context_factors: List[str]
+    all_scores: Optional[Dict[ExpertType, float]] = None
+    all_keywords: Optional[Dict[ExpertType, List[str]]] = None
+
+
+# Chit-chat turns that can never reach an expert on their own
+_TRIVIAL_QUERIES = frozenset({
+    "hi", "hello", "hey", "thanks", "thank you", "thx", "ok", "okay",
+    "yes", "no", "sure", "cool", "bye", "goodbye"
+})
+
+def _general_match() -> ExpertMatch:
+    """Result for trivial queries; mirrors what the full pipeline returns.
+    
+    Built per call because ExpertMatch holds mutable containers that callers
+    may change.
+    """
+    return ExpertMatch(
+        expert_type=ExpertType.GENERAL,
+        confidence=0.3,
+        reasoning="No specific expertise domain detected, using general assistant",
+        keywords_matched=[],
+        context_factors=[],
+        all_scores={et: (5 if et == ExpertType.GENERAL else 0) for et in ExpertType},
+        all_keywords={et: [] for et in ExpertType}
+    )
+
+
+@lru_cache(maxsize=512)
+def _format_reasoning(
+    expert_name: str,
+    keyword_sample: Tuple[str, ...],
+    extra_keywords: int,
+    context_factors: Tuple[str, ...]
+) -> str:
+    """Build the reasoning string; cached since few combinations recur."""
+    reasons = []
+    
+    if keyword_sample:
+        reasons.append(f"Keywords detected: {', '.join(keyword_sample)}")
+        if extra_keywords:
+            reasons.append(f"and {extra_keywords} more related terms")
+    
+    reasons.extend(context_factors)
+    
+    base_reason = f"Routing to {expert_name}"
+    
+    if reasons:
+        return f"{base_reason} based on: {'; '.join(reasons)}"
+    else:
+        return f"{base_reason} (default selection)"
 
 
 class ExpertRouter:
@@ -39,8 +90,25 @@ class ExpertRouter:
     expert based on user queries and conversation context.
     """
     
+    # Score weight for each keyword category (unlisted categories get 5)
+    CATEGORY_WEIGHTS = {
+        "primary": 15,
+        "commands": 10,
+        "package_managers": 12,
+        "keywords": 8,
+        "file_types": 10,
+        "fleet_operations": 12,
+        "monitoring": 8,
+        "data_operations": 10,
+        "api_endpoints": 15,
+        "troubleshooting": 8
+    }
+    
     def __init__(self):
         self.expert_keywords = self._initialize_expert_keywords()
+        self._experts = tuple(ExpertType)
+        self._expert_index = {et: i for i, et in enumerate(self._experts)}
+        self._keyword_table = self._compile_keyword_table()
         self.context_patterns = self._initialize_context_patterns()
         self.expert_descriptions = {
             ExpertType.GENERAL: "🤖 General Assistant",
@@ -149,6 +217,27 @@ class ExpertRouter:
             }
         }
     
+    def _compile_keyword_table(self) -> Tuple[Tuple[Tuple[str, int, re.Pattern], ...], ...]:
+        """
+        Flatten the keyword mappings into per-expert scoring tables.
+        
+        Each entry is ``(keyword, weight, word_boundary_pattern)``, with the
+        category weight and boundary regex resolved once here instead of on
+        every query. Tables are indexed by expert position in ``ExpertType``.
+        """
+        tables = []
+        for expert_type in self._experts:
+            entries = []
+            for category, keyword_list in self.expert_keywords.get(expert_type, {}).items():
+                weight = self.CATEGORY_WEIGHTS.get(category, 5)
+                for keyword in keyword_list:
+                    # Skip very short keywords that might cause false positives
+                    if len(keyword) < 2:
+                        continue
+                    entries.append((keyword, weight, re.compile(rf'\b{re.escape(keyword)}\b')))
+            tables.append(tuple(entries))
+        return tuple(tables)
+    
     def _initialize_context_patterns(self) -> Dict[str, ExpertType]:
         """Initialize regex patterns for context-based routing."""
         return {
@@ -192,40 +281,56 @@ class ExpertRouter:
         """
         query_lower = user_query.lower()
         
-        # Score each expert type
-        expert_scores = {}
-        matched_keywords = {}
+        # Fast path: without history or an active expert, a trivial turn
+        # always falls through to the general assistant
+        if (not conversation_history
+                and (not current_expert or current_expert == "general")
+                and self._is_trivial_query(query_lower)):
+            return _general_match()
+        
+        experts = self._experts
+        expert_index = self._expert_index
+        
+        # Score each expert type (list indexed by expert position avoids Enum hashing)
+        expert_scores = [0] * len(experts)
+        matched_keywords = []
         context_factors = []
         
-        for expert_type in ExpertType:
+        for i, expert_type in enumerate(experts):
             score, keywords = self._score_expert_match(query_lower, expert_type)
-            expert_scores[expert_type] = score
-            matched_keywords[expert_type] = keywords
+            expert_scores[i] = score
+            matched_keywords.append(keywords)
+        
+        # Keep the raw keyword scores so suggest_alternatives can reuse them
+        all_scores = dict(zip(experts, expert_scores))
+        all_keywords = dict(zip(experts, matched_keywords))
         
         # Apply context patterns
         pattern_expert = self._check_context_patterns(user_query)
         if pattern_expert:
-            expert_scores[pattern_expert] += 20
+            expert_scores[expert_index[pattern_expert]] += 20
             context_factors.append(f"Context pattern matched for {pattern_expert.value}")
         
         # Consider conversation history
         if conversation_history:
             history_expert = self._analyze_conversation_context(conversation_history)
             if history_expert:
-                expert_scores[history_expert] += 10
+                expert_scores[expert_index[history_expert]] += 10
                 context_factors.append(f"Conversation context suggests {history_expert.value}")
         
         # Apply current expert bias (slight preference to continue with same expert)
         if current_expert and current_expert != "general":
             try:
                 current_expert_type = ExpertType(current_expert)
-                expert_scores[current_expert_type] += 5
+                expert_scores[expert_index[current_expert_type]] += 5
                 context_factors.append(f"Continuity with current expert {current_expert}")
             except ValueError:
                 pass
-          # Determine best match
-        best_expert = max(expert_scores.keys(), key=lambda x: expert_scores[x])
-        best_score = expert_scores[best_expert]
+        
+        # Determine best match (first maximum wins, matching enum order)
+        best_index = max(range(len(experts)), key=expert_scores.__getitem__)
+        best_expert = experts[best_index]
+        best_score = expert_scores[best_index]
         
         # Calculate confidence (normalize score to 0-1 range)
         max_possible_score = 100  # Theoretical maximum
@@ -234,12 +339,13 @@ class ExpertRouter:
         # If no clear winner, default to general
         if best_score < 15:  # Minimum threshold for expert routing
             best_expert = ExpertType.GENERAL
+            best_index = expert_index[ExpertType.GENERAL]
             confidence = 0.3
             reasoning = "No specific expertise domain detected, using general assistant"
         else:
             reasoning = self._generate_reasoning(
                 best_expert, 
-                matched_keywords[best_expert], 
+                matched_keywords[best_index], 
                 context_factors
             )
         
@@ -247,45 +353,34 @@ class ExpertRouter:
             expert_type=best_expert,
             confidence=confidence,
             reasoning=reasoning,
-            keywords_matched=matched_keywords[best_expert],
-            context_factors=context_factors
+            keywords_matched=matched_keywords[best_index],
+            context_factors=context_factors,
+            all_scores=all_scores,
+            all_keywords=all_keywords
         )
     
+    @staticmethod
+    def _is_trivial_query(query_lower: str) -> bool:
+        """Check if a query is chit-chat or contains no words at all."""
+        stripped = query_lower.strip(" \t\n.,!?")
+        return stripped in _TRIVIAL_QUERIES or not any(c.isalpha() for c in stripped)
+    
     def _score_expert_match(self, query: str, expert_type: ExpertType) -> Tuple[float, List[str]]:
         """Score how well a query matches an expert type."""
         if expert_type == ExpertType.GENERAL:
             return 5, []  # Base score for general
         
-        keywords = self.expert_keywords.get(expert_type, {})
         score = 0
         matched = []
         
-        # Score each keyword category with different weights
-        for category, keyword_list in keywords.items():
-            category_weight = {
-                "primary": 15,
-                "commands": 10,
-                "package_managers": 12,
-                "keywords": 8,
-                "file_types": 10,
-                "fleet_operations": 12,
-                "monitoring": 8,
-                "data_operations": 10,
-                "api_endpoints": 15,
-                "troubleshooting": 8            }.get(category, 5)
-            
-            for keyword in keyword_list:
-                # Skip very short keywords that might cause false positives
-                if len(keyword) < 2:
-                    continue
-                    
-                if keyword in query:
-                    score += category_weight
-                    matched.append(keyword)
-                    
-                    # Bonus for exact matches or word boundaries
-                    if re.search(rf'\b{re.escape(keyword)}\b', query):
-                        score += 3
+        for keyword, weight, boundary in self._keyword_table[self._expert_index[expert_type]]:
+            if keyword in query:
+                score += weight
+                matched.append(keyword)
+                
+                # Bonus for exact matches or word boundaries
+                if boundary.search(query):
+                    score += 3
         
         return score, matched
     
@@ -328,24 +423,12 @@ class ExpertRouter:
         context_factors: List[str]
     ) -> str:
         """Generate human-readable reasoning for expert selection."""
-        reasons = []
-        
-        if keywords:
-            keyword_sample = keywords[:3]  # Show first 3 keywords
-            reasons.append(f"Keywords detected: {', '.join(keyword_sample)}")
-            if len(keywords) > 3:
-                reasons.append(f"and {len(keywords) - 3} more related terms")
-        
-        if context_factors:
-            reasons.extend(context_factors)
-        
-        expert_name = self.expert_descriptions[expert_type]
-        base_reason = f"Routing to {expert_name}"
-        
-        if reasons:
-            return f"{base_reason} based on: {'; '.join(reasons)}"
-        else:
-            return f"{base_reason} (default selection)"
+        return _format_reasoning(
+            self.expert_descriptions[expert_type],
+            tuple(keywords[:3]),  # Show first 3 keywords
+            max(len(keywords) - 3, 0),
+            tuple(context_factors)
+        )
     
     def get_expert_description(self, expert_type: ExpertType) -> str:
         """Get human-readable description of expert type."""
@@ -357,14 +440,25 @@ class ExpertRouter:
             return []  # High confidence, no alternatives needed
         
         alternatives = []
-        query_lower = query.lower()
+        
+        # Reuse the scores computed by route_query when available
+        all_scores = current_match.all_scores
+        all_keywords = current_match.all_keywords
+        if all_scores is None or all_keywords is None:
+            query_lower = query.lower()
+            all_scores, all_keywords = {}, {}
+            for expert_type in ExpertType:
+                all_scores[expert_type], all_keywords[expert_type] = self._score_expert_match(
+                    query_lower, expert_type
+                )
         
         # Find other potential matches
         for expert_type in ExpertType:
             if expert_type == current_match.expert_type:
                 continue
             
-            score, keywords = self._score_expert_match(query_lower, expert_type)
+            score = all_scores[expert_type]
+            keywords = all_keywords[expert_type]
             if score > 10:  # Only suggest if reasonable match
                 confidence = min(score / 100, 1.0)
                 reasoning = f"Alternative based on: {', '.join(keywords[:2])}"
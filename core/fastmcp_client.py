@@ -1,20 +1,34 @@
 """Clean MCP Client for FastMCP server integration."""
 
 import asyncio
-import json
+import importlib.util
+import itertools
 import logging
 import time
-import uuid
-from typing import Dict, Any, List, Optional, AsyncIterator
-from dataclasses import dataclass, asdict
+import weakref
+from typing import Dict, Any, Callable, List, Optional, AsyncIterator, Set, Tuple, Union
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit
 import httpx
-import websockets
-from websockets.exceptions import ConnectionClosed, WebSocketException
+import msgspec
 
-from config import get_settings
+try:
+    import fastjsonschema
+except ImportError:  # Optional: without it, parameters are only validated by the server
+    fastjsonschema = None
+
+from config import get_settings, MCPWireFormat
+from core.metrics import PerfMetrics
 
 logger = logging.getLogger(__name__)
+_SETTINGS = get_settings()
+
+# Request bodies are pre-encoded with msgspec, so the content type is set explicitly
+_JSON_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
+
+_WS_SCHEMES = {"http": "ws", "https": "wss"}
 
 
 class ErrorType(Enum):
@@ -29,72 +43,330 @@ class ErrorType(Enum):
     UNKNOWN_ERROR = "unknown_error"
 
 
-@dataclass
-class MCPRequest:
+class MCPRequest(msgspec.Struct, kw_only=True):
     """MCP request message."""
     jsonrpc: str = "2.0"
-    id: Optional[str] = None
+    id: str
     method: str = ""
     params: Optional[Dict[str, Any]] = None
 
-    def __post_init__(self):
-        if self.id is None:
-            self.id = str(uuid.uuid4())
-
 
-@dataclass
-class MCPResponse:
-    """MCP response message."""
-    jsonrpc: str
-    id: str
-    result: Optional[Dict[str, Any]] = None
+class MCPResponse(msgspec.Struct):
+    """MCP response message.
+    
+    ``result`` is kept as raw JSON so only the envelope is parsed eagerly;
+    MCPToolResult decodes it when its data is first read.
+    """
+    jsonrpc: str = "2.0"
+    id: Optional[str] = None
+    result: msgspec.Raw = msgspec.Raw()
     error: Optional[Dict[str, Any]] = None
 
 
-@dataclass
-class MCPTool:
+class MCPTool(msgspec.Struct):
     """MCP tool definition."""
     name: str
     description: str
     inputSchema: Dict[str, Any]
 
 
-@dataclass
+class _ToolList(msgspec.Struct):
+    """Result payload of a tools/list call."""
+    tools: List[MCPTool] = []
+
+
+# Shared codecs: encode structs directly and decode responses straight into MCPResponse
+_ENCODER = msgspec.json.Encoder()
+_RESPONSE_DECODER = msgspec.json.Decoder(MCPResponse)
+_TOOL_LIST_DECODER = msgspec.json.Decoder(Optional[_ToolList])
+# WebSocket frames and batched HTTP bodies may carry a single response or a JSON-RPC batch
+_FRAME_DECODER = msgspec.json.Decoder(Union[MCPResponse, List[MCPResponse]])
+_PAYLOAD_DECODER = msgspec.json.Decoder()
+
+# tools/list only differs by id between calls, so encode it once and splice the id in
+_ID_PLACEHOLDER = b"__PLACEHOLDER__"
+_TOOLS_LIST_TEMPLATE = _ENCODER.encode(MCPRequest(id=_ID_PLACEHOLDER.decode(), method="tools/list"))
+
+# MCP session handshake parameters sent on connect
+_INITIALIZE_PARAMS = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {},
+    "clientInfo": {"name": "fleetpulse-chat", "version": "1.0.0"},
+}
+
+# tools/call templates are built per tool name with the arguments spliced in the same way
+_ARGS_PLACEHOLDER = b"__ARGUMENTS__"
+
+
+
+@dataclass(frozen=True, slots=True)
+class _WireCodec:
+    """Encoder/decoders and content headers for one MCP wire format."""
+    headers: Dict[str, str]
+    encoder: Any
+    response_decoder: Any
+    tool_list_decoder: Any
+    frame_decoder: Any
+    payload_decoder: Any
+    is_json: bool
+
+
+_JSON_CODEC = _WireCodec(
+    headers=_JSON_HEADERS,
+    encoder=_ENCODER,
+    response_decoder=_RESPONSE_DECODER,
+    tool_list_decoder=_TOOL_LIST_DECODER,
+    frame_decoder=_FRAME_DECODER,
+    payload_decoder=_PAYLOAD_DECODER,
+    is_json=True,
+)
+# MessagePack is smaller and cheaper to (de)serialize, but servers must opt in
+_MSGPACK_CODEC = _WireCodec(
+    headers={"Content-Type": "application/msgpack", "Accept": "application/msgpack"},
+    encoder=msgspec.msgpack.Encoder(),
+    response_decoder=msgspec.msgpack.Decoder(MCPResponse),
+    tool_list_decoder=msgspec.msgpack.Decoder(Optional[_ToolList]),
+    frame_decoder=msgspec.msgpack.Decoder(Union[MCPResponse, List[MCPResponse]]),
+    payload_decoder=msgspec.msgpack.Decoder(),
+    is_json=False,
+)
+
+# Outgoing WebSocket queue bound (callers wait when it is full) and how many
+# queued requests the writer drains per wake-up
+_WS_QUEUE_SIZE = 1000
+_WS_WRITE_BATCH = 64
+
+# Connection pool limits for the shared HTTP client
+# HTTP/2 multiplexes concurrent tool calls over one TLS connection; httpx only
+# offers it when the optional h2 package is installed, so fall back to HTTP/1.1.
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30)
+
+
+def _websocket_url(url: str) -> str:
+    """Map an HTTP(S) server URL onto the matching WebSocket URL."""
+    parts = urlsplit(url if "://" in url else f"ws://{url}")
+    return urlunsplit(parts._replace(scheme=_WS_SCHEMES.get(parts.scheme, parts.scheme)))
+
+
+def _decode_tools(raw: msgspec.Raw, decoder=_TOOL_LIST_DECODER) -> Dict[str, MCPTool]:
+    """Decode a tools/list result straight into MCPTool structs keyed by name."""
+    result = decoder.decode(raw) if raw else None
+    return {tool.name: tool for tool in result.tools} if result else {}
+
+
+@lru_cache(maxsize=256)
+def _schema_validator(schema: bytes) -> Optional[Callable[[Any], Any]]:
+    """Compile a tool input schema once; identical schemas share a validator."""
+    try:
+        # use_default=False keeps validation from filling defaults into caller dicts
+        return fastjsonschema.compile(_PAYLOAD_DECODER.decode(schema), use_default=False)
+    except fastjsonschema.JsonSchemaDefinitionException as e:
+        logger.warning(f"Skipping local validation for unsupported tool schema: {e}")
+        return None
+
+
+def _compile_validators(tools: Dict[str, MCPTool]) -> Dict[str, Callable[[Any], Any]]:
+    """Build local parameter validators for tools that declare an input schema."""
+    if fastjsonschema is None:
+        return {}
+    validators = {}
+    for name, tool in tools.items():
+        if tool.inputSchema:
+            validator = _schema_validator(_ENCODER.encode(tool.inputSchema))
+            if validator is not None:
+                validators[name] = validator
+    return validators
+
+
+# Content-Length is only trusted for preallocation up to this size
+_MAX_PREALLOCATED_BODY = 16 * 1024 * 1024
+
+
+async def _read_body(response: httpx.Response) -> Union[bytes, bytearray]:
+    """Read a streamed body into one preallocated buffer when its size is known.
+    
+    ``aread`` collects chunks and joins them, holding the body twice at peak;
+    large tool results are filled into a single buffer instead. A missing,
+    malformed or oversized Content-Length falls back to incremental reading.
+    """
+    try:
+        size = int(response.headers.get("Content-Length", -1))
+    except ValueError:
+        size = -1
+    if not 0 <= size <= _MAX_PREALLOCATED_BODY or "Content-Encoding" in response.headers:
+        return await response.aread()
+    
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    offset = 0
+    chunks = response.aiter_raw()
+    async for chunk in chunks:
+        if offset + len(chunk) > size:
+            # More data than announced: stop filling in place and append the rest
+            view.release()
+            del buffer[offset:]
+            buffer += chunk
+            async for chunk in chunks:
+                buffer += chunk
+            return buffer
+        view[offset:offset + len(chunk)] = chunk
+        offset += len(chunk)
+    return buffer if offset == size else bytes(view[:offset])
+
+
+def _join_batch(payloads: List[bytes]) -> bytes:
+    """Combine encoded JSON requests into one JSON-RPC batch, or pass a lone request through."""
+    if len(payloads) == 1:
+        return payloads[0]
+    return b"[" + b",".join(payloads) + b"]"
+
+
+def _status_error_type(status_code: int) -> ErrorType:
+    """Map an HTTP error status onto the matching tool error type."""
+    if status_code in (401, 403):
+        return ErrorType.AUTHENTICATION_ERROR
+    if status_code == 404:
+        return ErrorType.TOOL_NOT_FOUND
+    if status_code in (400, 422):
+        return ErrorType.VALIDATION_ERROR
+    return ErrorType.SERVER_ERROR
+
+
+# Exception classes mapped to the error type reported for them; subclasses
+# resolve through their MRO, so e.g. httpx.ConnectTimeout maps as a timeout
+_EXCEPTION_ERROR_TYPES: Dict[type, ErrorType] = {
+    httpx.TimeoutException: ErrorType.TIMEOUT_ERROR,
+    asyncio.TimeoutError: ErrorType.TIMEOUT_ERROR,
+    httpx.TransportError: ErrorType.NETWORK_ERROR,
+    ConnectionError: ErrorType.NETWORK_ERROR,
+    msgspec.DecodeError: ErrorType.SERVER_ERROR,
+}
+
+
+def _error_type_for(error: Exception) -> ErrorType:
+    """Classify an unexpected exception from a tool call."""
+    for cls in type(error).__mro__:
+        error_type = _EXCEPTION_ERROR_TYPES.get(cls)
+        if error_type is not None:
+            return error_type
+    return ErrorType.UNKNOWN_ERROR
+
+
+def _import_websockets():
+    """Import websockets on first use, so HTTP-only deployments never load it."""
+    import websockets
+    from websockets.exceptions import WebSocketException
+    
+    _EXCEPTION_ERROR_TYPES.setdefault(WebSocketException, ErrorType.NETWORK_ERROR)
+    return websockets, WebSocketException
+
+
+@dataclass(slots=True, init=False)
 class MCPToolResult:
-    """MCP tool execution result."""
+    """MCP tool execution result.
+    
+    ``data`` may be given raw JSON, which is only decoded when first read.
+    """
     success: bool
-    data: Any
-    error: Optional[str] = None
-    error_type: Optional[ErrorType] = None
-    execution_time: Optional[float] = None
-    diagnostics: Optional[Dict[str, Any]] = None
+    _data: Any
+    error: Optional[str]
+    error_type: Optional[ErrorType]
+    execution_time: Optional[float]
+    diagnostics: Optional[Dict[str, Any]]
+    _raw: Optional[bytes] = field(repr=False, compare=False)
+    
+    def __init__(
+        self,
+        success: bool,
+        data: Any,
+        error: Optional[str] = None,
+        error_type: Optional[ErrorType] = None,
+        execution_time: Optional[float] = None,
+        diagnostics: Optional[Dict[str, Any]] = None
+    ):
+        self.success = success
+        self.error = error
+        self.error_type = error_type
+        self.execution_time = execution_time
+        self.diagnostics = diagnostics
+        if isinstance(data, msgspec.Raw):
+            # Copy the payload out so the response buffer it points into can be freed
+            self._raw = bytes(data) if data else None
+            self._data = None
+        else:
+            self._raw = None
+            self._data = data
+    
+    @property
+    def data(self) -> Any:
+        if self._raw is not None:
+            self._data = _PAYLOAD_DECODER.decode(self._raw)
+            self._raw = None
+        return self._data
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPDiagnostics:
     """Diagnostic information for MCP operations."""
     backend_status: Optional[str] = None
     database_accessible: Optional[bool] = None
     network_connectivity: Optional[bool] = None
-    last_successful_call: Optional[str] = None
+    last_successful_call: Optional[float] = None
     error_count: int = 0
-    performance_metrics: Optional[Dict[str, float]] = None
+    performance_metrics: PerfMetrics = field(default_factory=PerfMetrics)
+
+
+def _status_error_result(status_code: int) -> MCPToolResult:
+    """Tool result for an HTTP error status from the MCP server."""
+    return MCPToolResult(
+        success=False,
+        data=None,
+        error=f"HTTP {status_code} from MCP server",
+        error_type=_status_error_type(status_code)
+    )
 
 
 class FastMCPClient:
     """Client for connecting to FastMCP servers."""
     
+    # Pooled HTTP clients shared by all instances, one per event loop since an
+    # httpx client cannot be reused once its loop is closed
+    _shared_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+        weakref.WeakKeyDictionary()
+    )
+    
     def __init__(self):
-        self.settings = get_settings()
+        self.settings = _SETTINGS
         self.connection_type = self.settings.mcp_connection_type
         self.server_url = self.settings.mcp_server_url
+        self._ws_url = _websocket_url(self.server_url) if self.server_url else None
         self.server_command = self.settings.mcp_server_command
         self.timeout = self.settings.mcp_timeout
         self.max_retries = self.settings.mcp_max_retries
+        self._codec = (
+            _MSGPACK_CODEC if self.settings.mcp_wire_format == MCPWireFormat.MSGPACK else _JSON_CODEC
+        )
         
         self._tools: Dict[str, MCPTool] = {}
+        self._tool_list: Tuple[MCPTool, ...] = ()
+        self._validators: Dict[str, Callable[[Any], Any]] = {}
         self._websocket = None
-        self._http_client = None
+        # Set once websockets is imported; an empty tuple matches no exception
+        self._ws_errors: Tuple[type, ...] = ()
+        self._reader_task: Optional[asyncio.Task] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._out_queue: Optional[asyncio.Queue] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        # Request ids only need to be unique per connection, so a counter suffices
+        self._next_id = itertools.count(1)
+        self._call_templates: Dict[str, bytes] = {}
+        # Optional JSON-RPC batching: requests issued in the same loop tick share one send
+        self._batch_requests = self.settings.mcp_batch_requests
+        self._http_outbox: List[Tuple[str, bytes, asyncio.Future]] = []
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self._http_enabled = False
+        self._mcp_url: Optional[httpx.URL] = None
         self._initialized = False
         
         # Diagnostics tracking
@@ -103,6 +375,95 @@ class FastMCPClient:
         self._last_health_check = None
         self._health_check_interval = 300  # 5 minutes
     
+    @classmethod
+    def _get_shared_http_client(cls, timeout: float) -> httpx.AsyncClient:
+        """Get the pooled HTTP client for the running event loop, creating it once."""
+        loop = asyncio.get_running_loop()
+        client = cls._shared_http_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(timeout=timeout, limits=_HTTP_LIMITS, http2=_HTTP2_AVAILABLE)
+            cls._shared_http_clients[loop] = client
+        return client
+    
+    @classmethod
+    async def aclose_shared_http_client(cls):
+        """Close the pooled HTTP client bound to the running event loop, if any."""
+        client = cls._shared_http_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+    
+    @property
+    def _http_client(self) -> Optional[httpx.AsyncClient]:
+        """Pooled HTTP client for the running loop, or None when HTTP is not set up."""
+        if not self._http_enabled:
+            return None
+        return self._get_shared_http_client(self.timeout)
+    
+    def _new_request_id(self) -> str:
+        """Get the next request id for this client."""
+        return str(next(self._next_id))
+    
+    def _encode_tools_list(self) -> Tuple[str, bytes]:
+        """Encode a tools/list request in the active wire format."""
+        request_id = self._new_request_id()
+        if self._codec.is_json:
+            return request_id, _TOOLS_LIST_TEMPLATE.replace(_ID_PLACEHOLDER, request_id.encode())
+        return request_id, self._codec.encoder.encode(MCPRequest(id=request_id, method="tools/list"))
+    
+    def _encode_tool_call(self, tool_name: str, parameters: Dict[str, Any]) -> Tuple[str, bytes]:
+        """Encode a tools/call request, from the cached per-tool template for JSON."""
+        if not self._codec.is_json:
+            # Length-prefixed msgpack strings cannot be spliced, so encode in full
+            request_id = self._new_request_id()
+            return request_id, self._codec.encoder.encode(MCPRequest(
+                id=request_id,
+                method="tools/call",
+                params={"name": tool_name, "arguments": parameters}
+            ))
+        
+        template = self._call_templates.get(tool_name)
+        if template is None:
+            template = _ENCODER.encode(MCPRequest(
+                id=_ID_PLACEHOLDER.decode(),
+                method="tools/call",
+                params={"name": tool_name, "arguments": msgspec.Raw(_ARGS_PLACEHOLDER)}
+            ))
+            self._call_templates[tool_name] = template
+        
+        request_id = self._new_request_id()
+        payload = template.replace(_ID_PLACEHOLDER, request_id.encode(), 1).replace(
+            _ARGS_PLACEHOLDER, _ENCODER.encode(parameters), 1
+        )
+        return request_id, payload
+    
+    def _result_data(self, raw: msgspec.Raw) -> Any:
+        """Tool result payload: left raw for lazy JSON decoding, decoded now otherwise."""
+        if self._codec.is_json:
+            return raw
+        return self._codec.payload_decoder.decode(raw) if raw else None
+    
+    async def _send_mcp(self, content: bytes, codec: _WireCodec) -> Tuple[httpx.Response, Union[bytes, bytearray]]:
+        """POST to the MCP endpoint and read the streamed body."""
+        client = self._http_client
+        request = client.build_request("POST", self._mcp_url, content=content, headers=codec.headers)
+        response = await client.send(request, stream=True)
+        try:
+            return response, await _read_body(response)
+        finally:
+            await response.aclose()
+    
+    async def _post_mcp(self, encode: Callable[[], bytes]) -> Tuple[httpx.Response, Union[bytes, bytearray]]:
+        """POST a request to the MCP endpoint, falling back to JSON if msgpack is refused."""
+        codec = self._codec
+        response, body = await self._send_mcp(encode(), codec)
+        if response.status_code == 415 and not codec.is_json:
+            # A concurrent request may already have switched codecs
+            if self._codec is codec:
+                logger.info("MCP server does not accept msgpack, falling back to JSON")
+                self._codec = _JSON_CODEC
+            response, body = await self._send_mcp(encode(), self._codec)
+        return response, body
+    
     async def initialize(self) -> bool:
         """Initialize connection to MCP server."""
         try:
@@ -127,24 +488,23 @@ class FastMCPClient:
             self.diagnostics.backend_status = "No server URL configured"
             return False
         
-        self._http_client = httpx.AsyncClient(timeout=self.timeout)
+        # Parsed once so httpx does not re-parse the URL string on every post
+        self._mcp_url = httpx.URL(f"{self.server_url.rstrip('/')}/mcp")
+        self._http_enabled = True
         
-        # Test connection and get tools
+        # tools/list doubles as the connectivity check, so no separate health probe;
+        # the handshake runs alongside it so init costs one round trip
         try:
-            # First test if the server is reachable
-            try:
-                health_response = await self._http_client.get(f"{self.server_url}/health")
-                logger.info(f"MCP server health check: {health_response.status_code}")
-            except:
-                # Health endpoint might not exist, continue with tools list
-                pass
-            
-            tools = await self._list_tools_http()
-            self._tools = {tool.name: tool for tool in tools}
+            _, tools = await asyncio.gather(
+                self._initialize_session_http(),
+                self._list_tools_http()
+            )
+            self._set_tools(tools)
             self._initialized = True
+            self._last_health_check = time.monotonic()
             self.diagnostics.backend_status = "Connected"
             self.diagnostics.network_connectivity = True
-            self.diagnostics.last_successful_call = str(time.time())
+            self.diagnostics.last_successful_call = time.time()
             logger.info(f"FastMCP HTTP client initialized with {len(self._tools)} tools")
             return True
             
@@ -168,21 +528,30 @@ class FastMCPClient:
     
     async def _initialize_websocket(self) -> bool:
         """Initialize WebSocket connection to FastMCP server."""
-        if not self.server_url:
+        if not self._ws_url:
             logger.error("MCP_SERVER_URL required for WebSocket connection")
             return False
         
         try:
-            ws_url = self.server_url.replace("http://", "ws://").replace("https://", "wss://")
-            if not ws_url.startswith(("ws://", "wss://")):
-                ws_url = f"ws://{ws_url}"
-            
-            self._websocket = await websockets.connect(ws_url)
+            websockets, ws_error = _import_websockets()
+            self._ws_errors = (ws_error,)
+            self._websocket = await websockets.connect(
+                self._ws_url,
+                compression="deflate" if self.settings.mcp_ws_compression else None,
+            )
+            self._reader_task = asyncio.create_task(self._reader_loop())
+            self._out_queue = asyncio.Queue(maxsize=_WS_QUEUE_SIZE)
+            self._writer_task = asyncio.create_task(self._writer_loop())
             
-            # Test connection and get tools
-            tools = await self._list_tools_websocket()
-            self._tools = {tool.name: tool for tool in tools}
+            # The reader demultiplexes by id, so the handshake and tools/list
+            # can share one round trip instead of waiting on each other
+            _, tools = await asyncio.gather(
+                self._initialize_session_websocket(),
+                self._list_tools_websocket()
+            )
+            self._set_tools(tools)
             self._initialized = True
+            self._last_health_check = time.monotonic()
             logger.info(f"FastMCP WebSocket client initialized with {len(self._tools)} tools")
             return True
             
@@ -196,83 +565,240 @@ class FastMCPClient:
         logger.error("STDIO connection not yet implemented")
         return False
     
-    async def _list_tools_http(self) -> List[MCPTool]:
+    async def _list_tools_http(self) -> Dict[str, MCPTool]:
         """List available tools via HTTP."""
         if not self._http_client:
             raise Exception("HTTP client not initialized")
             
         try:
-            response = await self._http_client.post(
-                f"{self.server_url}/mcp",
-                json=asdict(MCPRequest(method="tools/list"))
-            )
+            response, body = await self._post_mcp(lambda: self._encode_tools_list()[1])
             response.raise_for_status()
             
-            mcp_response = MCPResponse(**response.json())
+            # tools/list is the health signal, so its round trip is the health check time
+            self.diagnostics.performance_metrics.health_check_time = response.elapsed.total_seconds()
+            
+            mcp_response = self._codec.response_decoder.decode(body)
             if mcp_response.error:
                 raise Exception(f"MCP error: {mcp_response.error}")
             
-            tools = []
-            if mcp_response.result:
-                for tool_data in mcp_response.result.get("tools", []):
-                    tools.append(MCPTool(
-                        name=tool_data["name"],
-                        description=tool_data["description"],
-                        inputSchema=tool_data["inputSchema"]
-                    ))
-            
-            return tools
+            return _decode_tools(mcp_response.result, self._codec.tool_list_decoder)
             
         except Exception as e:
             logger.error(f"Failed to list tools: {e}")
             self._error_count += 1
             raise
     
-    async def _list_tools_websocket(self) -> List[MCPTool]:
+    async def _initialize_session_http(self):
+        """Send the MCP initialize handshake over HTTP; failures are logged, not raised."""
+        try:
+            response, body = await self._post_mcp(lambda: self._codec.encoder.encode(
+                MCPRequest(id=self._new_request_id(), method="initialize", params=_INITIALIZE_PARAMS)
+            ))
+            if response.status_code >= 400:
+                logger.warning(f"MCP initialize rejected: HTTP {response.status_code}")
+                return
+            mcp_response = self._codec.response_decoder.decode(body)
+        except (httpx.HTTPError, msgspec.DecodeError) as e:
+            logger.warning(f"MCP initialize failed: {e}")
+            return
+        if mcp_response.error:
+            # Servers without a handshake still serve tools, so this is not fatal
+            logger.warning(f"MCP initialize rejected: {mcp_response.error}")
+    
+    async def _initialize_session_websocket(self):
+        """Send the MCP initialize handshake over the WebSocket."""
+        response = await self._send_websocket_request(
+            MCPRequest(id=self._new_request_id(), method="initialize", params=_INITIALIZE_PARAMS)
+        )
+        if response.error:
+            # Servers without a handshake still serve tools, so this is not fatal
+            logger.warning(f"MCP initialize rejected: {response.error}")
+    
+    async def _list_tools_websocket(self) -> Dict[str, MCPTool]:
         """List available tools via WebSocket."""
         try:
-            request = MCPRequest(method="tools/list")
-            response = await self._send_websocket_request(request)
+            response = await self._send_websocket_payload(*self._encode_tools_list())
             
             if response.error:
                 raise Exception(f"MCP error: {response.error}")
             
-            tools = []
-            if response.result:
-                for tool_data in response.result.get("tools", []):
-                    tools.append(MCPTool(
-                        name=tool_data["name"],
-                        description=tool_data["description"],
-                        inputSchema=tool_data["inputSchema"]
-                    ))
-            
-            return tools
+            return _decode_tools(response.result, self._codec.tool_list_decoder)
             
         except Exception as e:
             logger.error(f"Failed to list tools: {e}")
             self._error_count += 1
             raise
     
+    async def _reader_loop(self):
+        """Read WebSocket frames and resolve the pending request with the matching id."""
+        error: Optional[Exception] = None
+        # Bind this connection's pending map so a reconnect never sees our cleanup
+        pending = self._pending
+        try:
+            async for message in self._websocket:
+                try:
+                    decoded = self._codec.frame_decoder.decode(message)
+                except msgspec.DecodeError as e:
+                    logger.warning(f"Ignoring undecodable MCP frame: {e}")
+                    continue
+                
+                for response in decoded if isinstance(decoded, list) else (decoded,):
+                    future = pending.pop(response.id, None)
+                    if future is not None and not future.done():
+                        future.set_result(response)
+                    else:
+                        logger.debug(f"Dropping MCP response with unknown id: {response.id}")
+        except self._ws_errors as e:
+            logger.error(f"WebSocket error: {e}")
+            self._error_count += 1
+            error = e
+        finally:
+            # Fail any requests still waiting on this connection
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(
+                        ConnectionError(f"WebSocket communication failed: {error or 'connection closed'}")
+                    )
+            pending.clear()
+    
     async def _send_websocket_request(self, request: MCPRequest) -> MCPResponse:
-        """Send request via WebSocket and wait for response."""
+        """Send request via WebSocket and wait for the reader to deliver its response."""
+        return await self._send_websocket_payload(request.id, self._codec.encoder.encode(request))
+    
+    async def _send_websocket_payload(self, request_id: str, payload: bytes) -> MCPResponse:
+        """Send a pre-encoded request via WebSocket and wait for its response."""
         if not self._websocket:
-            raise Exception("WebSocket not connected")
+            raise ConnectionError("WebSocket not connected")
+        if self._reader_task is None or self._reader_task.done():
+            # Without the reader nothing would resolve the future before the timeout
+            raise ConnectionError("WebSocket reader is not running")
         
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
         try:
-            await self._websocket.send(json.dumps(asdict(request)))
-            response_data = await self._websocket.recv()
-            return MCPResponse(**json.loads(response_data))
-        except (ConnectionClosed, WebSocketException) as e:
+            # The writer task sends it; send failures arrive through the future
+            await self._out_queue.put((request_id, payload))
+            return await asyncio.wait_for(future, self.timeout)
+        finally:
+            self._pending.pop(request_id, None)
+    
+    def _is_fresh(self) -> bool:
+        """Whether this client can be reused without re-initializing."""
+        if not self._initialized or self._last_health_check is None:
+            return False
+        if time.monotonic() - self._last_health_check > self._health_check_interval:
+            return False
+        # A WebSocket connection is bound to the loop its reader task runs on
+        if self._reader_task is not None:
+            return (not self._reader_task.done()
+                    and self._reader_task.get_loop() is asyncio.get_running_loop())
+        return True
+    
+    def _drop_connection(self):
+        """Forget connection state, e.g. a WebSocket whose event loop has closed."""
+        self._websocket = None
+        self._reader_task = None
+        self._writer_task = None
+        self._out_queue = None
+        self._pending = {}
+        self._initialized = False
+    
+    def _batching(self) -> bool:
+        """Whether requests are coalesced into JSON-RPC batches."""
+        return self._batch_requests and self._codec.is_json
+    
+    def _track_batch_task(self, coro):
+        """Run a batch send in the background, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _writer_loop(self):
+        """Drain queued WebSocket requests, sending whatever has piled up in one go."""
+        queue = self._out_queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < _WS_WRITE_BATCH and not queue.empty():
+                batch.append(queue.get_nowait())
+            await self._send_ws_batch(batch)
+    
+    async def _send_ws_batch(self, batch: List[Tuple[str, bytes]]):
+        """Send queued requests, as one JSON-RPC batch frame when batching is on."""
+        try:
+            if self._batching():
+                await self._websocket.send(_join_batch([payload for _, payload in batch]))
+            else:
+                for _, payload in batch:
+                    await self._websocket.send(payload)
+        except self._ws_errors as e:
             logger.error(f"WebSocket error: {e}")
             self._error_count += 1
-            raise Exception(f"WebSocket communication failed: {e}")
+            for request_id, _ in batch:
+                future = self._pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_exception(ConnectionError(f"WebSocket communication failed: {e}"))
+    
+    async def _submit_http_batch(self, request_id: str, payload: bytes) -> MCPResponse:
+        """Queue a request for the next batched POST and wait for its response."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._http_outbox.append((request_id, payload, future))
+        if len(self._http_outbox) == 1:
+            loop.call_soon(self._flush_http_outbox)
+        return await future
+    
+    def _flush_http_outbox(self):
+        """POST every queued HTTP request as one batch."""
+        batch, self._http_outbox = self._http_outbox, []
+        if batch:
+            self._track_batch_task(self._post_http_batch(batch))
     
-    async def list_tools(self) -> List[MCPTool]:
-        """Get list of available tools."""
+    async def _post_http_batch(self, batch: List[Tuple[str, bytes, asyncio.Future]]):
+        """POST a batch and resolve each waiting request by id."""
+        futures = {request_id: future for request_id, _, future in batch}
+        try:
+            response = await self._http_client.post(
+                self._mcp_url,
+                content=_join_batch([payload for _, payload, _ in batch]),
+                headers=self._codec.headers
+            )
+            response.raise_for_status()
+            decoded = self._codec.frame_decoder.decode(response.content)
+        except Exception as e:
+            # Hand the failure to every caller, which maps it onto an ErrorType
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for mcp_response in decoded if isinstance(decoded, list) else (decoded,):
+            future = futures.pop(mcp_response.id, None)
+            if future is not None and not future.done():
+                future.set_result(mcp_response)
+        for request_id, future in futures.items():
+            if not future.done():
+                future.set_result(MCPResponse(
+                    id=request_id,
+                    error={"code": -32603, "message": "No response for request in batch"}
+                ))
+    
+    async def get_diagnostics(self) -> MCPDiagnostics:
+        """Get current diagnostic information."""
+        self.diagnostics.error_count = self._error_count
+        return self.diagnostics
+    
+    def _set_tools(self, tools: Dict[str, MCPTool]):
+        """Replace the known tools and the cached sequence handed out by list_tools."""
+        self._tools = tools
+        self._tool_list = tuple(tools.values())
+        self._validators = _compile_validators(tools)
+    
+    async def list_tools(self) -> Tuple[MCPTool, ...]:
+        """Get the available tools."""
         if not self._initialized:
             raise Exception("MCP client not initialized")
         
-        return list(self._tools.values())
+        return self._tool_list
     
     async def call_tool(self, tool_name: str, parameters: Dict[str, Any]) -> MCPToolResult:
         """Call a tool with given parameters."""
@@ -292,7 +818,21 @@ class FastMCPClient:
                 error_type=ErrorType.TOOL_NOT_FOUND
             )
         
-        start_time = time.time()
+        # Reject parameters the tool's schema rules out without a round trip
+        validator = self._validators.get(tool_name)
+        if validator is not None:
+            try:
+                validator(parameters)
+            except fastjsonschema.JsonSchemaValueException as e:
+                self._error_count += 1
+                return MCPToolResult(
+                    success=False,
+                    data=None,
+                    error=f"Invalid parameters for {tool_name}: {e.message}",
+                    error_type=ErrorType.VALIDATION_ERROR
+                )
+        
+        start_ns = time.perf_counter_ns()
         
         try:
             if self.connection_type == "http":
@@ -307,105 +847,116 @@ class FastMCPClient:
                     error_type=ErrorType.SERVER_ERROR
                 )
             
-            execution_time = time.time() - start_time
+            execution_time = (time.perf_counter_ns() - start_ns) / 1e9
             result.execution_time = execution_time
+            self.diagnostics.performance_metrics.tool_call_times.append(execution_time)
             
             if result.success:
-                self.diagnostics.last_successful_call = str(time.time())
+                self.diagnostics.last_successful_call = time.time()
             else:
                 self._error_count += 1
             
             return result
             
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = (time.perf_counter_ns() - start_ns) / 1e9
             self._error_count += 1
             return MCPToolResult(
                 success=False,
                 data=None,
                 error=str(e),
-                error_type=ErrorType.UNKNOWN_ERROR,
+                error_type=_error_type_for(e),
                 execution_time=execution_time
             )
     
     async def _call_tool_http(self, tool_name: str, parameters: Dict[str, Any]) -> MCPToolResult:
         """Call tool via HTTP."""
         if not self._http_client:
-            raise Exception("HTTP client not initialized")
-            
-        try:
-            request = MCPRequest(
-                method="tools/call",
-                params={
-                    "name": tool_name,
-                    "arguments": parameters
-                }
-            )
-            
-            response = await self._http_client.post(
-                f"{self.server_url}/mcp",
-                json=asdict(request)
+            return MCPToolResult(
+                success=False,
+                data=None,
+                error="HTTP client not initialized",
+                error_type=ErrorType.SERVER_ERROR
             )
-            response.raise_for_status()
-            
-            mcp_response = MCPResponse(**response.json())
-            if mcp_response.error:
-                return MCPToolResult(
-                    success=False,
-                    data=None,
-                    error=f"MCP error: {mcp_response.error}"
-                )
-            
+        
+        # Expected failures are reported through the result; only transport errors raise
+        try:
+            if self._batching():
+                mcp_response = await self._submit_http_batch(*self._encode_tool_call(tool_name, parameters))
+            else:
+                response, body = await self._post_mcp(lambda: self._encode_tool_call(tool_name, parameters)[1])
+                if response.status_code >= 400:
+                    return _status_error_result(response.status_code)
+                mcp_response = self._codec.response_decoder.decode(body)
+        except httpx.TimeoutException as e:
+            return MCPToolResult(success=False, data=None, error=str(e), error_type=ErrorType.TIMEOUT_ERROR)
+        except httpx.TransportError as e:
+            return MCPToolResult(success=False, data=None, error=str(e), error_type=ErrorType.NETWORK_ERROR)
+        except httpx.HTTPStatusError as e:
+            # Only raised for batched requests, which share one response status
+            return _status_error_result(e.response.status_code)
+        except msgspec.DecodeError as e:
             return MCPToolResult(
-                success=True,
-                data=mcp_response.result
+                success=False,
+                data=None,
+                error=f"Invalid MCP response: {e}",
+                error_type=ErrorType.SERVER_ERROR
             )
-            
-        except Exception as e:
+        
+        if mcp_response.error:
             return MCPToolResult(
                 success=False,
                 data=None,
-                error=str(e)
+                error=f"MCP error: {mcp_response.error}",
+                error_type=ErrorType.SERVER_ERROR
             )
+        
+        return MCPToolResult(
+            success=True,
+            data=self._result_data(mcp_response.result)
+        )
     
     async def _call_tool_websocket(self, tool_name: str, parameters: Dict[str, Any]) -> MCPToolResult:
         """Call tool via WebSocket."""
+        request_id, payload = self._encode_tool_call(tool_name, parameters)
         try:
-            request = MCPRequest(
-                method="tools/call",
-                params={
-                    "name": tool_name,
-                    "arguments": parameters
-                }
-            )
-            
-            response = await self._send_websocket_request(request)
-            
-            if response.error:
-                return MCPToolResult(
-                    success=False,
-                    data=None,
-                    error=f"MCP error: {response.error}"
-                )
-            
+            response = await self._send_websocket_payload(request_id, payload)
+        except asyncio.TimeoutError:
             return MCPToolResult(
-                success=True,
-                data=response.result
+                success=False,
+                data=None,
+                error=f"No response to {tool_name} within {self.timeout}s",
+                error_type=ErrorType.TIMEOUT_ERROR
             )
-            
-        except Exception as e:
+        except ConnectionError as e:
+            return MCPToolResult(success=False, data=None, error=str(e), error_type=ErrorType.NETWORK_ERROR)
+        
+        if response.error:
             return MCPToolResult(
                 success=False,
                 data=None,
-                error=str(e)
+                error=f"MCP error: {response.error}",
+                error_type=ErrorType.SERVER_ERROR
             )
+        
+        return MCPToolResult(
+            success=True,
+            data=self._result_data(response.result)
+        )
     
     async def close(self):
         """Clean up resources."""
         try:
-            if self._http_client:
-                await self._http_client.aclose()
-                self._http_client = None
+            # The pooled HTTP client is shared; see aclose_shared_http_client
+            self._http_enabled = False
+            
+            if self._writer_task:
+                self._writer_task.cancel()
+                self._writer_task = None
+            
+            if self._reader_task:
+                self._reader_task.cancel()
+                self._reader_task = None
             
             if self._websocket:
                 await self._websocket.close()
@@ -430,13 +981,24 @@ class FastMCPClient:
         return await self.call_tool(tool_name, parameters)
 
 
+# Process-wide client returned by get_mcp_client
+_client_instance: Optional[FastMCPClient] = None
+
+
 # Factory function to get the appropriate MCP client
 async def get_mcp_client() -> FastMCPClient:
-    """Get configured MCP client instance."""
-    settings = get_settings()
+    """Get the shared MCP client instance, initializing it on first use."""
+    global _client_instance
+    
+    if _client_instance is not None and _client_instance._is_fresh():
+        return _client_instance
     
     # Always use FastMCPClient; do not fall back to legacy REST client
-    client = FastMCPClient()
+    client = _client_instance or FastMCPClient()
+    if client._reader_task is not None and client._reader_task.get_loop() is asyncio.get_running_loop():
+        await client.close()
+    else:
+        client._drop_connection()
     
     # Initialize the client connection
     try:
@@ -449,4 +1011,10 @@ async def get_mcp_client() -> FastMCPClient:
         logger.error(f"Failed to initialize MCP client: {e}")
         # Return the client anyway - tools will show as offline but app won't crash
     
+    _client_instance = client
     return client
+
+
+async def close_shared_http_client():
+    """Close the pooled MCP HTTP client for the running loop before it shuts down."""
+    await FastMCPClient.aclose_shared_http_client()
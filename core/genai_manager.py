@@ -1,21 +1,110 @@
-"""GenAI Manager for coordinating multiple AI providers using Semantic Kernel."""
+"""GenAI Manager for coordinating multiple AI providers."""
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, AsyncIterator, List
+import time
+import weakref
+from typing import Dict, Any, Optional, AsyncIterator, List, Sequence
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 
-import semantic_kernel as sk
-from semantic_kernel.connectors.ai.open_ai import OpenAIChatCompletion
-from semantic_kernel.functions import KernelArguments
+import httpx
+import msgspec
 
 from config import GenAIProvider, get_settings
+from core.llm_cache import (
+    LLMCache, MemoryCacheBackend, RedisCacheBackend,
+    build_cache_key, compile_exclude_patterns, request_fingerprint
+)
+from core.retry import is_transient, stream_with_retry, with_retry
 
 logger = logging.getLogger(__name__)
 
+_EMBEDDING_MODEL = "text-embedding-3-small"
 
-@dataclass
+# Ollama is local: connect fast, but allow long generations
+_OLLAMA_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+_OLLAMA_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+
+class _OllamaMessage(msgspec.Struct):
+    content: str = ""
+
+
+class _OllamaChunk(msgspec.Struct):
+    """One line of Ollama's NDJSON chat stream; other fields are skipped."""
+    message: Optional[_OllamaMessage] = None
+
+
+_OLLAMA_CHUNK_DECODER = msgspec.json.Decoder(_OllamaChunk)
+
+_AZURE_API_VERSION = "2024-02-15-preview"
+_OPENAI_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+_OPENAI_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+
+
+class _LoopLocal:
+    """Lazily create one object, such as a pooled client, per event loop.
+    
+    The app runs each operation on a fresh event loop, and pooled connections
+    cannot be used from a loop other than the one that opened them.
+    """
+    
+    def __init__(self, factory):
+        self._factory = factory
+        self._items: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+    
+    def get(self):
+        """Get the object for the running loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        item = self._items.get(loop)
+        if item is None:
+            item = self._items[loop] = self._factory()
+        return item
+    
+    def pop(self):
+        """Forget and return the running loop's object, if one was created."""
+        return self._items.pop(asyncio.get_running_loop(), None)
+
+
+_STREAM_BUFFER_SIZE = 64
+_SENTINEL = object()
+
+
+async def _buffered(stream: AsyncIterator[str], maxsize: int = _STREAM_BUFFER_SIZE) -> AsyncIterator[str]:
+    """Read stream in a background task so the provider is not paced by the consumer.
+    
+    The bounded queue still applies back-pressure once maxsize chunks are
+    waiting. Errors from the stream are re-raised to the consumer.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+    
+    async def drain():
+        try:
+            async for chunk in stream:
+                await queue.put(chunk)
+        except Exception as e:
+            await queue.put(e)
+            return
+        finally:
+            await stream.aclose()
+        await queue.put(_SENTINEL)
+    
+    task = asyncio.create_task(drain())
+    try:
+        while (item := await queue.get()) is not _SENTINEL:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+@dataclass(frozen=True, slots=True)
 class ChatMessage:
     """Chat message structure."""
     role: str
@@ -23,6 +112,142 @@ class ChatMessage:
     timestamp: Optional[str] = None
 
 
+_GEMINI_LABELS = {"system": "System", "user": "User", "assistant": "Assistant"}
+
+
+def to_openai_messages(messages: Sequence[ChatMessage]) -> List[Dict[str, str]]:
+    """Format messages for OpenAI-style chat APIs (OpenAI, Azure OpenAI, Ollama)."""
+    return [{"role": msg.role, "content": msg.content} for msg in messages]
+
+
+def to_anthropic_messages(messages: Sequence[ChatMessage]) -> List[Dict[str, str]]:
+    """Format messages for Anthropic, which only takes user and assistant turns."""
+    return [{"role": msg.role, "content": msg.content} for msg in messages if msg.role in ("user", "assistant")]
+
+
+def to_gemini_prompt(messages: Sequence[ChatMessage]) -> str:
+    """Format the conversation as a single Gemini prompt."""
+    return "".join(
+        f"{_GEMINI_LABELS[msg.role]}: {msg.content}\n\n" for msg in messages if msg.role in _GEMINI_LABELS
+    )
+
+
+class _TokenBucket:
+    """Token bucket allowing a number of requests per minute, with bursts up to that number.
+    
+    A rate of 0 or less means unlimited.
+    """
+    
+    def __init__(self, requests_per_minute: int):
+        self.capacity = requests_per_minute
+        self.refill_rate = requests_per_minute / 60.0
+        self.tokens = float(requests_per_minute)
+        self.last_refill = time.monotonic()
+    
+    async def acquire(self):
+        """Wait until a request may be sent, then take a token for it."""
+        if self.capacity <= 0:
+            return
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+            self.last_refill = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.refill_rate)
+
+
+class _CircuitBreaker:
+    """Stop sending requests to a provider that keeps failing.
+    
+    After ``threshold`` consecutive transient failures the breaker opens and
+    the provider is skipped for ``cooldown`` seconds. A single trial request
+    is then let through (half-open): a success closes the breaker, a failure
+    reopens it. Non-transient errors such as a bad request or bad credentials
+    say nothing about the provider's health and never open the breaker.
+    """
+    
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.calls = 0
+        self.failures = 0
+        self.total_latency = 0.0
+    
+    def allow(self) -> bool:
+        """Whether a request may be sent now; when half-open, claims the one trial request."""
+        if self.opened_at is None:
+            return True
+        if self.trial_in_flight or time.monotonic() - self.opened_at < self.cooldown:
+            return False
+        self.trial_in_flight = True
+        return True
+    
+    def end_trial(self):
+        self.trial_in_flight = False
+    
+    def record_success(self, latency: float):
+        self.calls += 1
+        self.total_latency += latency
+        self.consecutive_failures = 0
+        self.opened_at = None
+    
+    def record_failure(self, latency: float, transient: bool = True):
+        self.calls += 1
+        self.failures += 1
+        self.total_latency += latency
+        if not transient:
+            return
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.threshold:
+            self.opened_at = time.monotonic()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Call counts, failure rate and mean latency for this provider."""
+        if self.opened_at is None:
+            state = "closed"
+        elif time.monotonic() - self.opened_at >= self.cooldown:
+            state = "half_open"
+        else:
+            state = "open"
+        return {
+            "state": state,
+            "calls": self.calls,
+            "failures": self.failures,
+            "failure_rate": self.failures / self.calls if self.calls else 0.0,
+            "avg_latency": self.total_latency / self.calls if self.calls else 0.0,
+        }
+
+
+class _RequestLimiter:
+    """Cap concurrent requests and request rate for one provider.
+    
+    Used as ``async with limiter:`` around a provider call. Holding a slot for
+    the whole call keeps a burst from turning into a wall of 429 responses.
+    """
+    
+    def __init__(self, max_concurrent: int, requests_per_minute: int):
+        self._semaphores = _LoopLocal(lambda: asyncio.Semaphore(max_concurrent))
+        self._bucket = _TokenBucket(requests_per_minute)
+    
+    async def __aenter__(self):
+        semaphore = self._semaphores.get()
+        await semaphore.acquire()
+        try:
+            await self._bucket.acquire()
+        except BaseException:
+            semaphore.release()
+            raise
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphores.get().release()
+
+
 class AIProvider(ABC):
     """Abstract base class for AI providers."""
     
@@ -35,105 +260,116 @@ class AIProvider(ABC):
     async def stream_completion(self, messages: List[ChatMessage], **kwargs) -> AsyncIterator[str]:
         """Streaming interface."""
         pass
+    
+    async def aclose(self):
+        """Release connections held for the running event loop."""
+        pass
 
 
-class OpenAIProvider(AIProvider):
-    """OpenAI provider implementation."""
+class _OpenAICompatibleProvider(AIProvider):
+    """Shared implementation for providers using the OpenAI chat completions API.
     
-    def __init__(self, api_key: str):
-        self.api_key = api_key
-        self.kernel = sk.Kernel()
-        self.chat_service = OpenAIChatCompletion(
-            service_id="openai_chat",
-            api_key=api_key,
-            ai_model_id="gpt-4"
-        )
-        self.kernel.add_service(self.chat_service)
+    Subclasses only differ in how the async client is built.
+    """
+    
+    name = "OpenAI"
+    
+    def __init__(self, model: str):
+        import openai
+        
+        self._openai = openai
+        self.model = model
+        self._clients = _LoopLocal(lambda: self._new_client())
+    
+    def _new_client(self):
+        """Create an async client with its own connection pool."""
+        raise NotImplementedError
+    
+    async def aclose(self):
+        """Close the client for the running event loop."""
+        client = self._clients.pop()
+        if client is not None:
+            await client.close()
     
     async def chat_completion(self, messages: List[ChatMessage], **kwargs) -> str:
-        """Get chat completion from OpenAI."""
+        """Get chat completion."""
         try:
-            # Convert messages to SK format
-            chat_history = sk.ChatHistory()
-            for msg in messages:
-                if msg.role == "user":
-                    chat_history.add_user_message(msg.content)
-                elif msg.role == "assistant":
-                    chat_history.add_assistant_message(msg.content)
-                elif msg.role == "system":
-                    chat_history.add_system_message(msg.content)
-            
-            # Get response
-            response = await self.chat_service.get_chat_message_content(
-                chat_history=chat_history,
-                settings=sk.connectors.ai.open_ai.OpenAIChatRequestSettings(
-                    max_tokens=kwargs.get("max_tokens", 2000),
-                    temperature=kwargs.get("temperature", 0.7)
-                )
+            response = await self._clients.get().chat.completions.create(
+                model=self.model,
+                messages=to_openai_messages(messages),
+                max_tokens=kwargs.get("max_tokens", 2000),
+                temperature=kwargs.get("temperature", 0.7)
             )
             
-            return str(response.content)
-        
+            return response.choices[0].message.content
+            
         except Exception as e:
-            logger.error(f"OpenAI chat completion error: {e}")
+            logger.error(f"{self.name} chat completion error: {e}")
             raise
     
     async def stream_completion(self, messages: List[ChatMessage], **kwargs) -> AsyncIterator[str]:
-        """Stream chat completion from OpenAI."""
+        """Stream chat completion."""
         try:
-            # Convert messages to SK format
-            chat_history = sk.ChatHistory()
-            for msg in messages:
-                if msg.role == "user":
-                    chat_history.add_user_message(msg.content)
-                elif msg.role == "assistant":
-                    chat_history.add_assistant_message(msg.content)
-                elif msg.role == "system":
-                    chat_history.add_system_message(msg.content)
+            response = await self._clients.get().chat.completions.create(
+                model=self.model,
+                messages=to_openai_messages(messages),
+                max_tokens=kwargs.get("max_tokens", 2000),
+                temperature=kwargs.get("temperature", 0.7),
+                stream=True
+            )
             
-            # Stream response
-            async for chunk in self.chat_service.get_streaming_chat_message_content(
-                chat_history=chat_history,
-                settings=sk.connectors.ai.open_ai.OpenAIChatRequestSettings(
-                    max_tokens=kwargs.get("max_tokens", 2000),
-                    temperature=kwargs.get("temperature", 0.7)
-                )
-            ):
-                if chunk.content:
-                    yield str(chunk.content)
-        
+            async for chunk in response:
+                # Azure sends a leading chunk with no choices (content filter results)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                    
         except Exception as e:
-            logger.error(f"OpenAI streaming error: {e}")
+            logger.error(f"{self.name} streaming error: {e}")
             raise
 
 
+class OpenAIProvider(_OpenAICompatibleProvider):
+    """OpenAI provider implementation."""
+    
+    def __init__(self, api_key: str, model: str = "gpt-4"):
+        super().__init__(model)
+        self.api_key = api_key
+    
+    def _new_client(self):
+        return self._openai.AsyncOpenAI(
+            api_key=self.api_key,
+            max_retries=0,  # GenAIManager retries
+            http_client=httpx.AsyncClient(timeout=_OPENAI_TIMEOUT, limits=_OPENAI_LIMITS)
+        )
+
+
 class AnthropicProvider(AIProvider):
     """Anthropic provider implementation."""
     
     def __init__(self, api_key: str):
+        import anthropic
+        
+        self._anthropic = anthropic
         self.api_key = api_key
-        # Note: Anthropic support in SK may be limited, implementing basic version
+        self._clients = _LoopLocal(lambda: self._anthropic.AsyncAnthropic(
+            api_key=api_key,
+            max_retries=0  # GenAIManager retries
+        ))
+    
+    async def aclose(self):
+        """Close the client for the running event loop."""
+        client = self._clients.pop()
+        if client is not None:
+            await client.close()
     
     async def chat_completion(self, messages: List[ChatMessage], **kwargs) -> str:
         """Get chat completion from Anthropic."""
         try:
-            import anthropic
-            client = anthropic.AsyncAnthropic(api_key=self.api_key)
-            
-            # Convert messages
-            formatted_messages = []
-            for msg in messages:
-                if msg.role in ["user", "assistant"]:
-                    formatted_messages.append({
-                        "role": msg.role,
-                        "content": msg.content
-                    })
-            
-            response = await client.messages.create(
+            response = await self._clients.get().messages.create(
                 model="claude-3-sonnet-20240229",
                 max_tokens=kwargs.get("max_tokens", 2000),
                 temperature=kwargs.get("temperature", 0.7),
-                messages=formatted_messages
+                messages=to_anthropic_messages(messages)
             )
             
             return response.content[0].text
@@ -145,23 +381,11 @@ class AnthropicProvider(AIProvider):
     async def stream_completion(self, messages: List[ChatMessage], **kwargs) -> AsyncIterator[str]:
         """Stream chat completion from Anthropic."""
         try:
-            import anthropic
-            client = anthropic.AsyncAnthropic(api_key=self.api_key)
-            
-            # Convert messages
-            formatted_messages = []
-            for msg in messages:
-                if msg.role in ["user", "assistant"]:
-                    formatted_messages.append({
-                        "role": msg.role,
-                        "content": msg.content
-                    })
-            
-            async with client.messages.stream(
+            async with self._clients.get().messages.stream(
                 model="claude-3-sonnet-20240229",
                 max_tokens=kwargs.get("max_tokens", 2000),
                 temperature=kwargs.get("temperature", 0.7),
-                messages=formatted_messages
+                messages=to_anthropic_messages(messages)
             ) as stream:
                 async for chunk in stream.text_stream:
                     yield chunk
@@ -175,6 +399,11 @@ class GoogleProvider(AIProvider):
     """Google Gemini provider implementation."""
     
     def __init__(self, api_key: str, model: str = "gemini-1.5-flash"):
+        import google.generativeai as genai
+        
+        # configure() sets module-global state, so do it once here
+        genai.configure(api_key=api_key)
+        self._genai = genai
         self.api_key = api_key
         self.model = model
         
@@ -185,38 +414,46 @@ class GoogleProvider(AIProvider):
             "gemini-1.0-pro",
             "models/gemini-pro"  # Legacy model name as last resort
         ]
+        # Try primary model first, then fallbacks
+        self.models_to_try = [model] + [m for m in self.fallback_models if m != model]
+        
+        self._models: Dict[str, Any] = {}
+        self._generation_configs: Dict[tuple, Any] = {}
+    
+    def _get_model(self, model_name: str):
+        """Get the cached GenerativeModel for a model name."""
+        model = self._models.get(model_name)
+        if model is None:
+            model = self._models[model_name] = self._genai.GenerativeModel(model_name)
+        return model
+    
+    def _generation_config(self, max_tokens: int, temperature: float):
+        """Get the cached GenerationConfig for these sampling parameters."""
+        key = (max_tokens, temperature)
+        config = self._generation_configs.get(key)
+        if config is None:
+            config = self._generation_configs[key] = self._genai.types.GenerationConfig(
+                max_output_tokens=max_tokens,
+                temperature=temperature
+            )
+        return config
     
     async def chat_completion(self, messages: List[ChatMessage], **kwargs) -> str:
         """Get chat completion from Google Gemini."""
         try:
-            import google.generativeai as genai
-            genai.configure(api_key=self.api_key)
-            
-            # Try primary model first, then fallbacks
-            models_to_try = [self.model] + [m for m in self.fallback_models if m != self.model]
+            # Format conversation for Gemini once, not per fallback model
+            prompt = to_gemini_prompt(messages)
+            generation_config = self._generation_config(kwargs.get("max_tokens", 2000), kwargs.get("temperature", 0.7))
             
             last_error = None
-            for model_name in models_to_try:
+            for model_name in self.models_to_try:
                 try:
-                    model = genai.GenerativeModel(model_name)
-                    
-                    # Format conversation for Gemini
-                    prompt = ""
-                    for msg in messages:
-                        if msg.role == "system":
-                            prompt += f"System: {msg.content}\n\n"
-                        elif msg.role == "user":
-                            prompt += f"User: {msg.content}\n\n"
-                        elif msg.role == "assistant":
-                            prompt += f"Assistant: {msg.content}\n\n"
+                    model = self._get_model(model_name)
                     
                     response = await asyncio.to_thread(
                         model.generate_content,
                         prompt,
-                        generation_config=genai.types.GenerationConfig(
-                            max_output_tokens=kwargs.get("max_tokens", 2000),
-                            temperature=kwargs.get("temperature", 0.7)
-                        )
+                        generation_config=generation_config
                     )
                     
                     logger.info(f"Successfully used Gemini model: {model_name}")
@@ -236,9 +473,41 @@ class GoogleProvider(AIProvider):
     
     async def stream_completion(self, messages: List[ChatMessage], **kwargs) -> AsyncIterator[str]:
         """Stream chat completion from Google Gemini."""
-        # Note: Implement streaming if available in Gemini API
-        response = await self.chat_completion(messages, **kwargs)
-        yield response
+        try:
+            prompt = to_gemini_prompt(messages)
+            generation_config = self._generation_config(kwargs.get("max_tokens", 2000), kwargs.get("temperature", 0.7))
+            
+            last_error = None
+            for model_name in self.models_to_try:
+                # Fall back to the next model only until the first chunk arrives
+                try:
+                    response = await asyncio.to_thread(
+                        self._get_model(model_name).generate_content,
+                        prompt,
+                        generation_config=generation_config,
+                        stream=True
+                    )
+                    chunks = iter(response)
+                    chunk = await asyncio.to_thread(next, chunks, None)
+                except Exception as model_error:
+                    logger.warning(f"Failed to use model {model_name}: {model_error}")
+                    last_error = model_error
+                    continue
+                
+                logger.info(f"Successfully used Gemini model: {model_name}")
+                # The SDK iterator blocks on the network, so pull each chunk in a thread
+                while chunk is not None:
+                    if chunk.parts:
+                        yield chunk.text
+                    chunk = await asyncio.to_thread(next, chunks, None)
+                return
+            
+            # If all models failed, raise the last error
+            raise last_error or Exception("All Gemini models failed")
+        
+        except Exception as e:
+            logger.error(f"Google Gemini streaming error: {e}")
+            raise
 
 
 class OllamaProvider(AIProvider):
@@ -246,32 +515,32 @@ class OllamaProvider(AIProvider):
     
     def __init__(self, base_url: str):
         self.base_url = base_url
+        self._clients = _LoopLocal(lambda: httpx.AsyncClient(
+            base_url=base_url,
+            timeout=_OLLAMA_TIMEOUT,
+            limits=_OLLAMA_LIMITS
+        ))
+    
+    async def aclose(self):
+        """Close the pooled client for the running event loop."""
+        client = self._clients.pop()
+        if client is not None:
+            await client.aclose()
     
     async def chat_completion(self, messages: List[ChatMessage], **kwargs) -> str:
         """Get chat completion from Ollama."""
         try:
-            import httpx
-            
-            # Format messages for Ollama
-            formatted_messages = []
-            for msg in messages:
-                formatted_messages.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
+            response = await self._clients.get().post(
+                "/api/chat",
+                json={
+                    "model": kwargs.get("model", "llama2"),
+                    "messages": to_openai_messages(messages),
+                    "stream": False
+                }
+            )
+            response.raise_for_status()
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/api/chat",
-                    json={
-                        "model": kwargs.get("model", "llama2"),
-                        "messages": formatted_messages,
-                        "stream": False
-                    }
-                )
-                response.raise_for_status()
-                
-                return response.json()["message"]["content"]
+            return response.json()["message"]["content"]
         
         except Exception as e:
             logger.error(f"Ollama chat completion error: {e}")
@@ -280,117 +549,59 @@ class OllamaProvider(AIProvider):
     async def stream_completion(self, messages: List[ChatMessage], **kwargs) -> AsyncIterator[str]:
         """Stream chat completion from Ollama."""
         try:
-            import httpx
-            import json
-            
-            # Format messages for Ollama
-            formatted_messages = []
-            for msg in messages:
-                formatted_messages.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
-            
-            async with httpx.AsyncClient() as client:
-                async with client.stream(
-                    "POST",
-                    f"{self.base_url}/api/chat",
-                    json={
-                        "model": kwargs.get("model", "llama2"),
-                        "messages": formatted_messages,
-                        "stream": True
-                    }
-                ) as response:
-                    response.raise_for_status()
-                    async for line in response.aiter_lines():
-                        if line:
-                            data = json.loads(line)
-                            if "message" in data and "content" in data["message"]:
-                                yield data["message"]["content"]
+            async with self._clients.get().stream(
+                "POST",
+                "/api/chat",
+                json={
+                    "model": kwargs.get("model", "llama2"),
+                    "messages": to_openai_messages(messages),
+                    "stream": True
+                }
+            ) as response:
+                response.raise_for_status()
+                # Split NDJSON on raw bytes: msgspec parses bytes directly, so
+                # decoding each line to str first would be wasted work
+                buffer = bytearray()
+                async for data in response.aiter_bytes():
+                    buffer += data
+                    start = 0
+                    while (end := buffer.find(b"\n", start)) >= 0:
+                        if end > start:
+                            chunk = _OLLAMA_CHUNK_DECODER.decode(buffer[start:end])
+                            if chunk.message and chunk.message.content:
+                                yield chunk.message.content
+                        start = end + 1
+                    del buffer[:start]
+                
+                if buffer.strip():
+                    chunk = _OLLAMA_CHUNK_DECODER.decode(buffer)
+                    if chunk.message and chunk.message.content:
+                        yield chunk.message.content
         
         except Exception as e:
             logger.error(f"Ollama streaming error: {e}")
             raise
 
 
-class AzureOpenAIProvider(AIProvider):
+class AzureOpenAIProvider(_OpenAICompatibleProvider):
     """Azure OpenAI provider implementation."""
     
+    name = "Azure OpenAI"
+    
     def __init__(self, api_key: str, endpoint: str, deployment_name: str = "gpt-4"):
+        super().__init__(deployment_name)
         self.api_key = api_key
         self.endpoint = endpoint
         self.deployment_name = deployment_name
-        
-    async def chat_completion(self, messages: List[ChatMessage], **kwargs) -> str:
-        """Get chat completion from Azure OpenAI."""
-        try:
-            import openai
-            
-            # Configure Azure OpenAI client
-            client = openai.AzureOpenAI(
-                api_key=self.api_key,
-                azure_endpoint=self.endpoint,
-                api_version="2024-02-15-preview"
-            )
-            
-            # Format messages for OpenAI API
-            formatted_messages = []
-            for msg in messages:
-                formatted_messages.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
-            
-            response = await asyncio.to_thread(
-                client.chat.completions.create,
-                model=self.deployment_name,
-                messages=formatted_messages,
-                max_tokens=kwargs.get("max_tokens", 2000),
-                temperature=kwargs.get("temperature", 0.7)
-            )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            logger.error(f"Azure OpenAI chat completion error: {e}")
-            raise
     
-    async def stream_completion(self, messages: List[ChatMessage], **kwargs) -> AsyncIterator[str]:
-        """Stream chat completion from Azure OpenAI."""
-        try:
-            import openai
-            
-            # Configure Azure OpenAI client
-            client = openai.AzureOpenAI(
-                api_key=self.api_key,
-                azure_endpoint=self.endpoint,
-                api_version="2024-02-15-preview"
-            )
-            
-            # Format messages for OpenAI API
-            formatted_messages = []
-            for msg in messages:
-                formatted_messages.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
-            
-            response = await asyncio.to_thread(
-                client.chat.completions.create,
-                model=self.deployment_name,
-                messages=formatted_messages,
-                max_tokens=kwargs.get("max_tokens", 2000),
-                temperature=kwargs.get("temperature", 0.7),
-                stream=True
-            )
-            
-            for chunk in response:
-                if chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
-                    
-        except Exception as e:
-            logger.error(f"Azure OpenAI streaming error: {e}")
-            raise
+    def _new_client(self):
+        return self._openai.AsyncAzureOpenAI(
+            api_key=self.api_key,
+            azure_endpoint=self.endpoint,
+            api_version=_AZURE_API_VERSION,
+            max_retries=0,  # GenAIManager retries
+            http_client=httpx.AsyncClient(timeout=_OPENAI_TIMEOUT, limits=_OPENAI_LIMITS)
+        )
 
 
 class GenAIManager:
@@ -400,31 +611,100 @@ class GenAIManager:
         self.settings = get_settings()
         self.providers: Dict[GenAIProvider, AIProvider] = {}
         self._initialize_providers()
+        self._limiters = {
+            provider: _RequestLimiter(
+                self.settings.genai_max_concurrent_requests,
+                self.settings.rate_limit_requests_per_minute
+            )
+            for provider in self.providers
+        }
+        self._breakers = {
+            provider: _CircuitBreaker(self.settings.genai_breaker_threshold, self.settings.genai_breaker_cooldown)
+            for provider in self.providers
+        }
+        self.cache = self._build_cache()
+        self._cache_exclude = compile_exclude_patterns(self.settings.llm_cache_exclude_patterns)
+        self._inflight: Dict[str, asyncio.Task] = {}
     
     def _initialize_providers(self):
         """Initialize available providers based on configuration."""
         if self.settings.openai_api_key:            
-            self.providers[GenAIProvider.OPENAI] = OpenAIProvider(self.settings.openai_api_key)
+            self._add_provider(GenAIProvider.OPENAI, lambda: OpenAIProvider(self.settings.openai_api_key))
         
         if self.settings.anthropic_api_key:
-            self.providers[GenAIProvider.ANTHROPIC] = AnthropicProvider(self.settings.anthropic_api_key)
+            self._add_provider(GenAIProvider.ANTHROPIC, lambda: AnthropicProvider(self.settings.anthropic_api_key))
         
         if self.settings.google_api_key:
             # Use gemini-1.5-flash as the default model
             google_model = getattr(self.settings, 'google_model', 'gemini-1.5-flash')
-            self.providers[GenAIProvider.GOOGLE] = GoogleProvider(self.settings.google_api_key, google_model)
+            self._add_provider(GenAIProvider.GOOGLE, lambda: GoogleProvider(self.settings.google_api_key, google_model))
         
         if self.settings.azure_openai_key and self.settings.azure_openai_endpoint:
             # Azure OpenAI requires both API key and endpoint
             azure_deployment = getattr(self.settings, 'azure_deployment_name', 'gpt-4')
-            self.providers[GenAIProvider.AZURE] = AzureOpenAIProvider(
+            self._add_provider(GenAIProvider.AZURE, lambda: AzureOpenAIProvider(
                 self.settings.azure_openai_key, 
                 self.settings.azure_openai_endpoint,
                 azure_deployment
-            )
+            ))
         
         if self.settings.ollama_base_url:
-            self.providers[GenAIProvider.OLLAMA] = OllamaProvider(self.settings.ollama_base_url)
+            self._add_provider(GenAIProvider.OLLAMA, lambda: OllamaProvider(self.settings.ollama_base_url))
+    
+    def _add_provider(self, provider: GenAIProvider, factory):
+        """Register a provider, leaving it out if its SDK is not installed."""
+        try:
+            self.providers[provider] = factory()
+        except ImportError as e:
+            logger.error(f"{provider.value} provider unavailable, SDK not installed: {e}")
+    
+    def _build_cache(self) -> Optional[LLMCache]:
+        """Create the response cache from settings, or None when it is disabled."""
+        if not self.settings.llm_cache_enabled:
+            return None
+        
+        backend = None
+        if self.settings.llm_cache_backend == "redis" and self.settings.redis_url:
+            try:
+                backend = RedisCacheBackend(self.settings.redis_url, ttl=self.settings.llm_cache_ttl)
+            except ImportError:
+                logger.warning("redis package not installed, using the in-memory LLM cache")
+        if backend is None:
+            backend = MemoryCacheBackend(
+                max_entries=self.settings.llm_cache_max_entries,
+                ttl=self.settings.llm_cache_ttl
+            )
+        
+        return LLMCache(
+            backend,
+            embed=self._build_embedder(),
+            similarity_threshold=self.settings.llm_cache_similarity_threshold,
+            max_semantic_entries=self.settings.llm_cache_max_entries
+        )
+    
+    def _build_embedder(self):
+        """Embedding function for the semantic cache layer, if it is enabled."""
+        if not self.settings.llm_semantic_cache:
+            return None
+        openai_provider = self.providers.get(GenAIProvider.OPENAI)
+        if openai_provider is None:
+            logger.warning("Semantic LLM cache needs OPENAI_API_KEY for embeddings, disabling it")
+            return None
+        
+        async def embed(text: str) -> Sequence[float]:
+            # Share the OpenAI provider's pooled client
+            response = await openai_provider._clients.get().embeddings.create(model=_EMBEDDING_MODEL, input=text)
+            return response.data[0].embedding
+        
+        return embed
+    
+    async def aclose(self):
+        """Close provider connections opened on the running event loop."""
+        await asyncio.gather(*(provider.aclose() for provider in self.providers.values()))
+    
+    def get_provider_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Circuit state, call counts, failure rate and latency per provider."""
+        return {GenAIProvider(provider).value: breaker.stats() for provider, breaker in self._breakers.items()}
     
     def get_available_providers(self) -> List[GenAIProvider]:
         """Get list of available providers."""
@@ -442,7 +722,81 @@ class GenAIManager:
         if provider not in self.providers:
             raise ValueError(f"Provider {provider} not available")
         
-        return await self.providers[provider].chat_completion(messages, **kwargs)
+        if self.settings.genai_coalesce_requests:
+            fingerprint = request_fingerprint(GenAIProvider(provider).value, messages, kwargs)
+            return await self._coalesced(fingerprint, lambda: self._completion_with_fallback(provider, messages, kwargs))
+        
+        return await self._completion_with_fallback(provider, messages, kwargs)
+    
+    def _fallback_order(self, provider: GenAIProvider) -> List[GenAIProvider]:
+        """The requested provider followed by the configured, available fallbacks."""
+        order = [GenAIProvider(provider)]
+        for fallback in self.settings.genai_fallback_chain:
+            if fallback in self.providers and fallback not in order:
+                order.append(fallback)
+        return order
+    
+    async def _completion_with_fallback(self, provider: GenAIProvider, messages: List[ChatMessage], kwargs: Dict[str, Any]) -> str:
+        """Try the provider, then each fallback, skipping providers whose circuit is open."""
+        provider = GenAIProvider(provider)
+        last_error: Optional[Exception] = None
+        for candidate in self._fallback_order(provider):
+            breaker = self._breakers[candidate]
+            trial = breaker.opened_at is not None
+            if not breaker.allow():
+                logger.warning(f"Skipping provider {candidate.value}: circuit open after repeated failures")
+                continue
+            try:
+                return await self._cached_completion(candidate, messages, kwargs)
+            except Exception as e:
+                logger.warning(f"Provider {candidate.value} failed: {e}")
+                last_error = e
+            finally:
+                if trial:
+                    breaker.end_trial()
+        
+        raise last_error or RuntimeError(f"Provider {provider.value} unavailable: circuit open after repeated failures")
+    
+    async def _coalesced(self, fingerprint: str, compute) -> str:
+        """Share one in-flight call between concurrent identical requests."""
+        task = self._inflight.get(fingerprint)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(compute())
+            self._inflight[fingerprint] = task
+            task.add_done_callback(
+                lambda done: self._inflight.pop(fingerprint) if self._inflight.get(fingerprint) is done else None
+            )
+        # A caller giving up must not cancel the call for everyone else
+        return await asyncio.shield(task)
+    
+    async def _cached_completion(self, provider: GenAIProvider, messages: List[ChatMessage], kwargs: Dict[str, Any]) -> str:
+        """Answer from the response cache when the request is cacheable, else call the provider."""
+        key = None
+        if self.cache:
+            key = build_cache_key(GenAIProvider(provider).value, messages, kwargs, exclude=self._cache_exclude)
+        if key is None:
+            return await self._provider_completion(provider, messages, kwargs)
+        
+        return await self.cache.get_or_compute(key, lambda: self._provider_completion(provider, messages, kwargs))
+    
+    async def _provider_completion(self, provider: GenAIProvider, messages: List[ChatMessage], kwargs: Dict[str, Any]) -> str:
+        """Call a provider within its concurrency and rate limits, retrying transient failures."""
+        async def attempt() -> str:
+            async with self._limiters[provider]:
+                return await asyncio.wait_for(
+                    self.providers[provider].chat_completion(messages, **kwargs),
+                    timeout=self.settings.genai_request_timeout
+                )
+        
+        breaker = self._breakers[provider]
+        start = time.perf_counter()
+        try:
+            response = await with_retry(attempt, attempts=self.settings.genai_retry_attempts)
+        except Exception as e:
+            breaker.record_failure(time.perf_counter() - start, transient=is_transient(e))
+            raise
+        breaker.record_success(time.perf_counter() - start)
+        return response
     
     async def stream_completion(
         self, 
@@ -456,5 +810,20 @@ class GenAIManager:
         if provider not in self.providers:
             raise ValueError(f"Provider {provider} not available")
         
-        async for chunk in self.providers[provider].stream_completion(messages, **kwargs):
+        async def attempt() -> AsyncIterator[str]:
+            async with self._limiters[provider]:
+                stream = self.providers[provider].stream_completion(messages, **kwargs)
+                try:
+                    while True:
+                        # Time out a stalled stream, not a long one
+                        try:
+                            chunk = await asyncio.wait_for(anext(stream), timeout=self.settings.genai_stream_timeout)
+                        except StopAsyncIteration:
+                            return
+                        yield chunk
+                finally:
+                    await stream.aclose()
+        
+        chunks = stream_with_retry(attempt, attempts=self.settings.genai_retry_attempts)
+        async for chunk in _buffered(chunks):
             yield chunk
\ No newline at end of file
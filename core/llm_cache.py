@@ -0,0 +1,260 @@
+"""Response cache for GenAI chat completions.
+
+Two layers sit in front of the providers:
+
+* L1 is an exact-match cache keyed on a SHA-256 of the full request
+  (provider, model, sampling parameters and every message).
+* L2 is an optional semantic cache: the last user message is embedded and
+  compared against earlier questions asked in the same conversation context;
+  a cosine similarity at or above the threshold returns the earlier answer.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Pattern, Protocol, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Embedder = Callable[[str], Awaitable[Sequence[float]]]
+
+
+class CacheBackend(Protocol):
+    """Storage for exact-match cache entries."""
+
+    ttl: float  # seconds an entry is kept; the semantic layer uses it too
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, if any."""
+        ...
+
+    async def set(self, key: str, value: str) -> None:
+        """Store a response under key."""
+        ...
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache with a per-entry TTL."""
+
+    def __init__(self, max_entries: int = 512, ttl: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class RedisCacheBackend:
+    """Redis-backed cache, shared between app instances."""
+
+    def __init__(self, url: str, ttl: float = 3600.0, prefix: str = "fleetpulse:llm:"):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url, decode_responses=True)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._redis.get(self.prefix + key)
+
+    async def set(self, key: str, value: str) -> None:
+        await self._redis.set(self.prefix + key, value, ex=int(self.ttl))
+
+
+@dataclass(frozen=True, slots=True)
+class CacheKey:
+    """Identifies a cacheable request."""
+    exact: str    # hash of the full request
+    context: str  # hash of the request without the last user message
+    query: str    # last user message, matched semantically
+
+
+def _digest(payload: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _request_fields(provider: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "provider": provider,
+        "model": params.get("model"),
+        "temperature": params.get("temperature", 0.7),
+        "max_tokens": params.get("max_tokens", 2000),
+    }
+
+
+def request_fingerprint(provider: str, messages: Sequence[Any], params: Dict[str, Any]) -> str:
+    """Hash identifying a request by provider, model, sampling parameters and messages."""
+    return _digest({**_request_fields(provider, params), "messages": [[m.role, m.content] for m in messages]})
+
+
+def compile_exclude_patterns(patterns: Sequence[str]) -> Optional[Pattern[str]]:
+    """Combine regexes for questions that must never be answered from the cache."""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+
+
+def build_cache_key(
+    provider: str,
+    messages: Sequence[Any],
+    params: Dict[str, Any],
+    exclude: Optional[Pattern[str]] = None,
+) -> Optional[CacheKey]:
+    """Build the cache key for a request, or None when it must not be cached.
+
+    Only deterministic requests (temperature 0) without tools are cached;
+    sampled responses are expected to differ between calls, and tool calls
+    act on live data. Questions matching exclude (e.g. "what time is it")
+    are not cached either.
+    """
+    if params.get("temperature", 0.7) != 0 or params.get("tools"):
+        return None
+    if not messages or messages[-1].role != "user":
+        return None
+    if exclude is not None and exclude.search(messages[-1].content):
+        return None
+
+    request = _request_fields(provider, params)
+    turns = [[m.role, m.content] for m in messages]
+    return CacheKey(
+        exact=_digest({**request, "messages": turns}),
+        context=_digest({**request, "messages": turns[:-1]}),
+        query=messages[-1].content,
+    )
+
+
+class _SemanticIndex:
+    """Normalized query embeddings, their responses and expiry times for one context."""
+
+    __slots__ = ("vectors", "responses", "expires")
+
+    def __init__(self, dimensions: int):
+        import numpy as np
+
+        self.vectors = np.empty((0, dimensions), dtype=np.float32)
+        self.responses: List[str] = []
+        self.expires = np.empty(0, dtype=np.float64)
+
+    def prune(self, now: float):
+        """Drop entries whose expiry time has passed."""
+        live = self.expires > now
+        if not live.all():
+            self.vectors = self.vectors[live]
+            self.expires = self.expires[live]
+            self.responses = [response for response, keep in zip(self.responses, live) if keep]
+
+
+class LLMCache:
+    """Exact-match cache with an optional semantic layer."""
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        embed: Optional[Embedder] = None,
+        similarity_threshold: float = 0.95,
+        max_semantic_entries: int = 512,
+    ):
+        self.backend = backend
+        self.embed = embed
+        self.similarity_threshold = similarity_threshold
+        self.max_semantic_entries = max_semantic_entries
+        self._indexes: "OrderedDict[str, _SemanticIndex]" = OrderedDict()
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "errors": 0}
+
+    async def get_or_compute(self, key: CacheKey, compute: Callable[[], Awaitable[str]]) -> str:
+        """Return a cached response for key, or compute and cache a new one."""
+        try:
+            cached = await self.backend.get(key.exact)
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            self.stats["errors"] += 1
+            cached = None
+        if cached is not None:
+            self.stats["exact_hits"] += 1
+            return cached
+
+        vector = await self._embed(key.query)
+        if vector is not None:
+            cached = self._semantic_lookup(key.context, vector)
+            if cached is not None:
+                self.stats["semantic_hits"] += 1
+                return cached
+
+        self.stats["misses"] += 1
+        response = await compute()
+
+        try:
+            await self.backend.set(key.exact, response)
+        except Exception as e:
+            logger.warning(f"LLM cache store failed: {e}")
+            self.stats["errors"] += 1
+        if vector is not None:
+            self._semantic_store(key.context, vector, response)
+        return response
+
+    async def _embed(self, text: str) -> Optional["np.ndarray"]:
+        """Embed text as a unit vector, or None when the semantic layer is off."""
+        if self.embed is None:
+            return None
+        # numpy is only needed by the semantic layer, so it is not imported at startup
+        import numpy as np
+
+        try:
+            vector = np.asarray(await self.embed(text), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"LLM cache embedding failed: {e}")
+            self.stats["errors"] += 1
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _semantic_lookup(self, context: str, vector: "np.ndarray") -> Optional[str]:
+        index = self._indexes.get(context)
+        if index is None or index.vectors.shape[1] != vector.shape[0]:
+            return None
+        index.prune(time.monotonic())
+        if not index.responses:
+            return None
+        similarities = index.vectors @ vector
+        best = int(similarities.argmax())
+        if similarities[best] >= self.similarity_threshold:
+            return index.responses[best]
+        return None
+
+    def _semantic_store(self, context: str, vector: "np.ndarray", response: str):
+        import numpy as np
+
+        index = self._indexes.get(context)
+        if index is None or index.vectors.shape[1] != vector.shape[0]:
+            index = self._indexes[context] = _SemanticIndex(vector.shape[0])
+        self._indexes.move_to_end(context)
+
+        # Expire with the exact-match entry, so neither layer outlives the TTL
+        expires_at = time.monotonic() + self.backend.ttl
+        index.vectors = np.vstack((index.vectors, vector))[-self.max_semantic_entries:]
+        index.responses = (index.responses + [response])[-self.max_semantic_entries:]
+        index.expires = np.append(index.expires, expires_at)[-self.max_semantic_entries:]
+        while len(self._indexes) > self.max_semantic_entries:
+            self._indexes.popitem(last=False)
@@ -1,18 +1,131 @@
 """MCP Client for FleetPulse integration."""
 
 import asyncio
+import importlib.util
 import logging
-import json
+import string
+import threading
 import time
-from typing import Dict, Any, List, Optional, Union
-from dataclasses import dataclass, asdict
+import weakref
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Hashable, List, Optional, Tuple, Union
+from dataclasses import dataclass, field, replace
 from enum import Enum
+from functools import lru_cache
 import httpx
+import msgspec
 
-from config import get_settings
+try:
+    import fastjsonschema
+except ImportError:  # Optional: without it, only required parameters are checked
+    fastjsonschema = None
+
+from config import FleetPulseHTTPBackend, get_settings
+from core.metrics import PerfMetrics
 
 logger = logging.getLogger(__name__)
 
+# Pool for the shared API client; probes pass shorter per-request timeouts
+# HTTP/2 multiplexes concurrent tool calls over one connection; httpx only
+# offers it when the optional h2 package is installed, so fall back to HTTP/1.1.
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30)
+# Multiplexed streams replace most sockets, so HTTP/2 needs a much smaller pool
+_HTTP2_LIMITS = httpx.Limits(max_keepalive_connections=10, max_connections=20, keepalive_expiry=30)
+
+# Request bodies are pre-encoded with msgspec, so the content type is set explicitly
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class _AiohttpClient:
+    """The subset of httpx.AsyncClient used here, backed by an aiohttp session.
+    
+    Responses and errors are converted to their httpx equivalents, so error
+    classification and callers work the same with either backend.
+    """
+    
+    # aiohttp has already decoded and de-chunked the body
+    _DROPPED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+    # httpx computes these for the request; aiohttp sets its own
+    _GENERATED_HEADERS = frozenset({"host", "content-length"})
+    
+    def __init__(self):
+        import aiohttp
+        
+        self._aiohttp = aiohttp
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=_HTTP_LIMITS.max_connections,
+                keepalive_timeout=_HTTP_LIMITS.keepalive_expiry
+            ),
+            timeout=aiohttp.ClientTimeout(total=_HTTP_TIMEOUT.read, connect=_HTTP_TIMEOUT.connect)
+        )
+    
+    @property
+    def is_closed(self) -> bool:
+        return self._session.closed
+    
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> httpx.Response:
+        return await self._request(httpx.Request("GET", url, params=params), timeout)
+    
+    async def post(self, url: str, content: bytes = b"", headers: Optional[Dict[str, str]] = None,
+                   timeout: Optional[float] = None) -> httpx.Response:
+        return await self._request(httpx.Request("POST", url, content=content, headers=headers), timeout)
+    
+    async def _request(self, request: httpx.Request, timeout: Optional[float]) -> httpx.Response:
+        aiohttp = self._aiohttp
+        headers = [(k, v) for k, v in request.headers.items() if k.lower() not in self._GENERATED_HEADERS]
+        # Without a per-call timeout the session's ClientTimeout applies
+        extra = {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout is not None else {}
+        try:
+            async with self._session.request(
+                request.method,
+                str(request.url),
+                data=request.content or None,
+                headers=headers,
+                **extra
+            ) as response:
+                body = await response.read()
+        except asyncio.TimeoutError as e:
+            raise httpx.ReadTimeout("Request timed out", request=request) from e
+        except aiohttp.ClientConnectorError as e:
+            raise httpx.ConnectError(str(e), request=request) from e
+        except aiohttp.ClientError as e:
+            raise httpx.TransportError(str(e), request=request) from e
+        
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in self._DROPPED_HEADERS]
+        return httpx.Response(response.status, headers=headers, content=body, request=request)
+    
+    async def aclose(self):
+        await self._session.close()
+
+
+# Loop for synchronous callers, started on first use and kept for the process
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    """Get the background event loop that runs tool calls for synchronous callers."""
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="fleetpulse-mcp-sync", daemon=True).start()
+            _sync_loop = loop
+    return _sync_loop
+
+
+def _elapsed_since(start_ns: int) -> float:
+    """Seconds elapsed since a ``time.perf_counter_ns()`` reading."""
+    return (time.perf_counter_ns() - start_ns) / 1e9
+
+
+def _copy_data(data: Any) -> Any:
+    """Independent copy of decoded JSON data; a round trip is cheaper than copy.deepcopy."""
+    return msgspec.json.decode(msgspec.json.encode(data))
+
 
 class ErrorType(Enum):
     """Types of MCP tool errors."""
@@ -26,7 +139,7 @@ class ErrorType(Enum):
     UNKNOWN_ERROR = "unknown_error"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MCPTool:
     """MCP tool definition."""
     name: str
@@ -34,7 +147,7 @@ class MCPTool:
     parameters: Dict[str, Any]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MCPToolResult:
     """MCP tool execution result."""
     success: bool
@@ -45,28 +158,327 @@ class MCPToolResult:
     diagnostics: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPDiagnostics:
     """Diagnostic information for MCP operations."""
     backend_status: Optional[str] = None
     database_accessible: Optional[bool] = None
     network_connectivity: Optional[bool] = None
-    last_successful_call: Optional[str] = None
+    last_successful_call: Optional[float] = None
     error_count: int = 0
-    performance_metrics: Optional[Dict[str, float]] = None
+    performance_metrics: PerfMetrics = field(default_factory=PerfMetrics)
+
+
+def _register_tools() -> Dict[str, MCPTool]:
+    """Register available MCP tools for FleetPulse."""
+    return {
+        "health_check": MCPTool(
+            name="health_check",
+            description="Check backend and MCP server health status",
+            parameters={}
+        ),
+        "list_hosts": MCPTool(
+            name="list_hosts",
+            description="List all hosts with metadata (OS, last update, package count)",
+            parameters={}
+        ),
+        "get_host_details": MCPTool(
+            name="get_host_details",
+            description="Get detailed information about a specific host",
+            parameters={
+                "hostname": {
+                    "type": "string",
+                    "description": "Name of the host to query",
+                    "required": True
+                }
+            }
+        ),
+        "get_update_reports": MCPTool(
+            name="get_update_reports",
+            description="Retrieve package update reports with filtering",
+            parameters={
+                "hostname": {
+                    "type": "string",
+                    "description": "Filter by hostname (optional)",
+                    "required": False
+                },
+                "days": {
+                    "type": "integer",
+                    "description": "Number of days to look back (default: 30)",
+                    "required": False,
+                    "default": 30
+                }
+            }
+        ),
+        "get_host_reports": MCPTool(
+            name="get_host_reports",
+            description="Get update reports for a specific host",
+            parameters={
+                "hostname": {
+                    "type": "string",
+                    "description": "Name of the host",
+                    "required": True
+                },
+                "days": {
+                    "type": "integer",
+                    "description": "Number of days to look back (default: 30)",
+                    "required": False,
+                    "default": 30
+                }
+            }
+        ),
+        "list_packages": MCPTool(
+            name="list_packages",
+            description="List all packages across the fleet",
+            parameters={
+                "search": {
+                    "type": "string",
+                    "description": "Search term to filter packages (optional)",
+                    "required": False
+                }
+            }
+        ),
+        "get_package_details": MCPTool(
+            name="get_package_details",
+            description="Get detailed package information across the fleet",
+            parameters={
+                "package_name": {
+                    "type": "string",
+                    "description": "Name of the package",
+                    "required": True
+                }
+            }
+        ),
+        "get_fleet_statistics": MCPTool(
+            name="get_fleet_statistics",
+            description="Get aggregate statistics and activity metrics",
+            parameters={}
+        ),
+        "search": MCPTool(
+            name="search",
+            description="Search across hosts, packages, and reports",
+            parameters={
+                "query": {
+                    "type": "string",
+                    "description": "Search query",
+                    "required": True
+                }
+            }
+        )
+    }
+
+
+def _tool_schema(tool: MCPTool) -> Dict[str, Any]:
+    """JSON Schema for a tool's parameters.
+    
+    Required strings must also be non-empty; optional parameters may be null,
+    which LLM tool calls often send for arguments they leave out.
+    """
+    properties = {}
+    for name, spec in tool.parameters.items():
+        if spec.get("required"):
+            properties[name] = {"type": spec["type"]}
+            if spec["type"] == "string":
+                properties[name]["minLength"] = 1
+        else:
+            properties[name] = {"type": [spec["type"], "null"]}
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": [name for name, spec in tool.parameters.items() if spec.get("required")]
+    }
+
+
+def _coerce_parameters(tool: MCPTool, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert numeric strings given for integer parameters, e.g. {"days": "7"}."""
+    coerced = None
+    for name, spec in tool.parameters.items():
+        value = parameters.get(name)
+        if spec["type"] != "integer" or not isinstance(value, str):
+            continue
+        try:
+            number = int(value.strip())
+        except ValueError:
+            continue  # left for the validator to reject
+        if coerced is None:
+            coerced = dict(parameters)
+        coerced[name] = number
+    return parameters if coerced is None else coerced
+
+
+def _compile_validators(tools: Dict[str, MCPTool]) -> Dict[str, Callable[[Any], Any]]:
+    """Compile a parameter validator per tool."""
+    if fastjsonschema is None:
+        return {}
+    # use_default=False keeps validation from filling defaults into caller dicts
+    return {name: fastjsonschema.compile(_tool_schema(tool), use_default=False) for name, tool in tools.items()}
+
+
+@dataclass(frozen=True, slots=True)
+class _Route:
+    """FleetPulse API request behind a tool."""
+    method: str
+    path: str  # format template over the tool's parameters
+    query: Tuple[Tuple[str, str], ...] = ()  # (tool parameter, query parameter), sent when set
+    cache_ttl: float = 10.0  # seconds a successful result is reused; 0 disables caching
+    _parts: Tuple[Tuple[str, Optional[str]], ...] = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        # Split the template once into (literal, parameter) pairs
+        parts = tuple((literal, name) for literal, name, _, _ in string.Formatter().parse(self.path))
+        object.__setattr__(self, "_parts", parts)
+    
+    def format_path(self, values: Dict[str, Any]) -> str:
+        """Fill the path template with parameter values."""
+        if len(self._parts) == 1 and self._parts[0][1] is None:
+            return self.path
+        return "".join(literal + str(values[name]) if name else literal for literal, name in self._parts)
+
+
+_ROUTES = {
+    "health_check": _Route("GET", "/health", cache_ttl=0),
+    "list_hosts": _Route("GET", "/api/hosts", cache_ttl=30.0),
+    "get_host_details": _Route("GET", "/api/hosts/{hostname}"),
+    "get_update_reports": _Route("GET", "/api/reports", (("hostname", "hostname"), ("days", "days"))),
+    "get_host_reports": _Route("GET", "/api/hosts/{hostname}/reports", (("days", "days"),)),
+    "list_packages": _Route("GET", "/api/packages", (("search", "search"),), cache_ttl=30.0),
+    "get_package_details": _Route("GET", "/api/packages/{package_name}", cache_ttl=30.0),
+    "get_fleet_statistics": _Route("GET", "/api/stats", cache_ttl=5.0),
+    "search": _Route("GET", "/api/search", (("query", "q"),)),
+}
+
+
+# Tool definitions are static, so every client shares one registry and its validators
+_TOOLS = _register_tools()
+_VALIDATORS = _compile_validators(_TOOLS)
+# The catalog never changes, so hand out one tuple
+_TOOL_LIST = tuple(_TOOLS.values())
+_AVAILABLE_TOOLS = ", ".join(_TOOLS)
+# Declared parameter order per tool, so cache keys need no sorting
+_PARAM_ORDER = {name: tuple(tool.parameters) for name, tool in _TOOLS.items()}
 
 
 class FleetPulseMCPClient:
     """Client for FleetPulse MCP integration."""
     
+    # A successful API call within this window already proved the database is reachable
+    _DB_PROBE_TTL = 60.0
+    # Overall deadline for a diagnostics refresh
+    _DIAGNOSTICS_TIMEOUT = 8.0
+    # Diagnostics refresh period shrinks from 270s towards 30s as tool calls fail
+    # and grows back as they succeed (a saturating "local health multiplier")
+    _HEALTH_CHECK_BASE = 30.0
+    _HEALTH_MULTIPLIER_MAX = 8
+    
+    # Successful read results are reused for their route's cache_ttl
+    _RESULT_CACHE_SIZE = 256
+    
+    # Error guidance, formatted with tool_name and base_url
+    _GUIDANCE_TEMPLATES = {
+        ErrorType.TOOL_NOT_FOUND: "The {tool_name} tool or resource was not found. This could indicate an API endpoint change or the resource doesn't exist.",
+        ErrorType.NETWORK_ERROR: "Unable to connect to FleetPulse backend. Please check if the service is running on {base_url} and verify network connectivity.",
+        ErrorType.DATABASE_ERROR: "Database access issue detected. The FleetPulse database may be locked, corrupted, or inaccessible. Check database file permissions and run integrity checks.",
+        ErrorType.AUTHENTICATION_ERROR: "Authentication failed. Please verify API keys, tokens, or service account configuration.",
+        ErrorType.VALIDATION_ERROR: "Invalid parameters provided to {tool_name}. Please check the parameter format and required fields.",
+        ErrorType.TIMEOUT_ERROR: "Request to {tool_name} timed out. The backend service may be overloaded or experiencing performance issues.",
+        ErrorType.SERVER_ERROR: "FleetPulse backend server error occurred while executing {tool_name}. Check backend service logs for details.",
+        ErrorType.UNKNOWN_ERROR: "An unexpected error occurred with {tool_name}. Check logs for detailed error information."
+    }
+    
+    # Recovery actions per error type, formatted with base_url
+    _RECOVERY_ACTIONS = {
+        ErrorType.NETWORK_ERROR: (
+            "Check if FleetPulse backend service is running",
+            "Verify network connectivity to the backend",
+            "Test with: curl -f {base_url}/health",
+            "Check firewall and proxy settings"
+        ),
+        ErrorType.DATABASE_ERROR: (
+            "Check database file permissions",
+            "Run SQLite integrity check: sqlite3 fleetpulse.db 'PRAGMA integrity_check;'",
+            "Verify database is not locked by other processes",
+            "Consider restarting FleetPulse backend service"
+        ),
+        ErrorType.TIMEOUT_ERROR: (
+            "Check backend service performance and load",
+            "Verify system resources (CPU, memory, disk)",
+            "Consider increasing timeout values",
+            "Check for long-running database queries"
+        ),
+        ErrorType.AUTHENTICATION_ERROR: (
+            "Verify API authentication configuration",
+            "Check service account permissions",
+            "Refresh authentication tokens if applicable"
+        ),
+        ErrorType.SERVER_ERROR: (
+            "Check FleetPulse backend service logs",
+            "Restart backend service if needed",
+            "Verify system resources availability",
+            "Check for recent configuration changes"
+        )
+    }
+    _DEFAULT_RECOVERY_ACTIONS = ("Check logs for more details", "Contact system administrator")
+    
+    # Pooled HTTP clients shared by all instances, one per event loop since an
+    # httpx client cannot be reused once its loop is closed
+    _shared_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Union[httpx.AsyncClient, _AiohttpClient]]" = (
+        weakref.WeakKeyDictionary()
+    )
+    
     def __init__(self):
         self.settings = get_settings()
         self.base_url = self.settings.fleetpulse_api_url
-        self.tools = self._register_tools()
+        self.tools = _TOOLS
         self.diagnostics = MCPDiagnostics()
         self._error_count = 0
         self._last_health_check = None
-        self._health_check_interval = 300  # 5 minutes
+        self._health_multiplier = 0
+        self._health_check_interval = self._HEALTH_CHECK_BASE * (self._HEALTH_MULTIPLIER_MAX + 1)
+        self._health_task: Optional[asyncio.Task] = None
+        self._last_api_success: Optional[float] = None
+        self._result_cache: "OrderedDict[Hashable, Tuple[float, MCPToolResult]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._sync_client: Optional["FleetPulseMCPClient"] = None
+    
+    def _get_shared_http_client(self) -> Union[httpx.AsyncClient, _AiohttpClient]:
+        """Get the pooled HTTP client for the running event loop, creating it once."""
+        loop = asyncio.get_running_loop()
+        client = self._shared_http_clients.get(loop)
+        if client is None or client.is_closed:
+            if self.settings.fleetpulse_http_backend == FleetPulseHTTPBackend.AIOHTTP:
+                client = _AiohttpClient()
+            else:
+                client = httpx.AsyncClient(
+                    timeout=_HTTP_TIMEOUT,
+                    limits=_HTTP2_LIMITS if _HTTP2_AVAILABLE else _HTTP_LIMITS,
+                    http2=_HTTP2_AVAILABLE
+                )
+            self._shared_http_clients[loop] = client
+        return client
+    
+    @classmethod
+    async def aclose_shared_http_client(cls):
+        """Close the pooled HTTP client bound to the running event loop, if any."""
+        client = cls._shared_http_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+    
+    async def aclose(self):
+        """Finish a running diagnostics refresh and release connections opened on the running event loop.
+        
+        Call this before closing the event loop; the refresh is bounded by
+        _DIAGNOSTICS_TIMEOUT, so waiting for it is cheap compared to losing it.
+        """
+        task = self._health_task
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            await task
+        await self.aclose_shared_http_client()
+    
+    async def __aenter__(self) -> "FleetPulseMCPClient":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
     
     async def get_diagnostics(self) -> MCPDiagnostics:
         """Get current diagnostic information."""
@@ -74,54 +486,43 @@ class FleetPulseMCPClient:
         return self.diagnostics
     
     async def _update_diagnostics(self):
-        """Update diagnostic information."""
+        """Update diagnostic information.
+        
+        One database-backed API request answers for the network, the backend
+        and the database at once.
+        """
+        start_ns = time.perf_counter_ns()
         try:
-            # Check backend health
-            start_time = time.time()
-            backend_healthy = await self._check_backend_health()
-            health_check_time = time.time() - start_time
-            
-            self.diagnostics.backend_status = "healthy" if backend_healthy else "unhealthy"
-            self.diagnostics.network_connectivity = backend_healthy
-            
-            if not hasattr(self.diagnostics, 'performance_metrics') or self.diagnostics.performance_metrics is None:
-                self.diagnostics.performance_metrics = {}
-            
-            self.diagnostics.performance_metrics["health_check_time"] = health_check_time
-            self.diagnostics.error_count = self._error_count
-            
-            # Check database accessibility (through API)
-            try:
+            async with asyncio.timeout(self._DIAGNOSTICS_TIMEOUT):
                 await self._test_database_connectivity()
-                self.diagnostics.database_accessible = True
-            except Exception as e:
-                logger.warning(f"Database connectivity test failed: {e}")
-                self.diagnostics.database_accessible = False
-                
-        except Exception as e:
-            logger.error(f"Failed to update diagnostics: {e}")
-    
-    async def _check_backend_health(self) -> bool:
-        """Check if FleetPulse backend is healthy."""
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.base_url}/health")
-                return response.status_code == 200
+            healthy = True
         except Exception as e:
             logger.warning(f"Backend health check failed: {e}")
-            return False
+            healthy = False
+        
+        self.diagnostics.backend_status = "healthy" if healthy else "unhealthy"
+        self.diagnostics.network_connectivity = healthy
+        self.diagnostics.database_accessible = healthy
+        self.diagnostics.performance_metrics.health_check_time = _elapsed_since(start_ns)
+        self.diagnostics.error_count = self._error_count
+        self._last_health_check = time.monotonic()
     
     async def _test_database_connectivity(self):
         """Test database connectivity through API."""
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{self.base_url}/api/hosts?limit=1")
-            response.raise_for_status()
+        if (self._last_api_success is not None and
+            time.monotonic() - self._last_api_success < self._DB_PROBE_TTL):
+            return
+        
+        client = self._get_shared_http_client()
+        response = await client.get(f"{self.base_url}/api/hosts?limit=1", timeout=5.0)
+        response.raise_for_status()
     
     def _classify_error(self, error: Exception, response: Optional[httpx.Response] = None) -> ErrorType:
         """Classify error type for better handling."""
-        if isinstance(error, httpx.TimeoutException):
+        if isinstance(error, (httpx.TimeoutException, TimeoutError)):
             return ErrorType.TIMEOUT_ERROR
-        elif isinstance(error, httpx.ConnectError):
+        elif isinstance(error, httpx.TransportError):
+            # Connection, read and protocol failures, from either HTTP backend
             return ErrorType.NETWORK_ERROR
         elif isinstance(error, httpx.HTTPStatusError):
             if response and response.status_code == 401:
@@ -134,6 +535,9 @@ class FleetPulseMCPClient:
                 return ErrorType.VALIDATION_ERROR
             else:
                 return ErrorType.SERVER_ERROR
+        elif isinstance(error, msgspec.DecodeError):
+            # The backend answered, but not with valid JSON
+            return ErrorType.SERVER_ERROR
         elif "database" in str(error).lower() or "sqlite" in str(error).lower():
             return ErrorType.DATABASE_ERROR
         else:
@@ -141,17 +545,8 @@ class FleetPulseMCPClient:
     
     def _get_error_guidance(self, error_type: ErrorType, tool_name: str) -> str:
         """Get user-friendly error guidance based on error type."""
-        guidance_map = {
-            ErrorType.TOOL_NOT_FOUND: f"The {tool_name} tool or resource was not found. This could indicate an API endpoint change or the resource doesn't exist.",
-            ErrorType.NETWORK_ERROR: f"Unable to connect to FleetPulse backend. Please check if the service is running on {self.base_url} and verify network connectivity.",
-            ErrorType.DATABASE_ERROR: "Database access issue detected. The FleetPulse database may be locked, corrupted, or inaccessible. Check database file permissions and run integrity checks.",
-            ErrorType.AUTHENTICATION_ERROR: "Authentication failed. Please verify API keys, tokens, or service account configuration.",
-            ErrorType.VALIDATION_ERROR: f"Invalid parameters provided to {tool_name}. Please check the parameter format and required fields.",
-            ErrorType.TIMEOUT_ERROR: f"Request to {tool_name} timed out. The backend service may be overloaded or experiencing performance issues.",
-            ErrorType.SERVER_ERROR: f"FleetPulse backend server error occurred while executing {tool_name}. Check backend service logs for details.",
-            ErrorType.UNKNOWN_ERROR: f"An unexpected error occurred with {tool_name}. Check logs for detailed error information."
-        }
-        return guidance_map.get(error_type, "An unknown error occurred.")
+        template = self._GUIDANCE_TEMPLATES.get(error_type, "An unknown error occurred.")
+        return template.format(tool_name=tool_name, base_url=self.base_url)
     
     async def _create_error_result(self, tool_name: str, error: Exception, response: Optional[httpx.Response] = None) -> MCPToolResult:
         """Create a comprehensive error result with diagnostics."""
@@ -188,138 +583,12 @@ class FleetPulseMCPClient:
     
     def _get_recovery_actions(self, error_type: ErrorType) -> List[str]:
         """Get specific recovery actions for each error type."""
-        actions_map = {
-            ErrorType.NETWORK_ERROR: [
-                "Check if FleetPulse backend service is running",
-                "Verify network connectivity to the backend",
-                "Test with: curl -f {}/health".format(self.base_url),
-                "Check firewall and proxy settings"
-            ],
-            ErrorType.DATABASE_ERROR: [
-                "Check database file permissions",
-                "Run SQLite integrity check: sqlite3 fleetpulse.db 'PRAGMA integrity_check;'",
-                "Verify database is not locked by other processes",
-                "Consider restarting FleetPulse backend service"
-            ],
-            ErrorType.TIMEOUT_ERROR: [
-                "Check backend service performance and load",
-                "Verify system resources (CPU, memory, disk)",
-                "Consider increasing timeout values",
-                "Check for long-running database queries"
-            ],
-            ErrorType.AUTHENTICATION_ERROR: [
-                "Verify API authentication configuration",
-                "Check service account permissions",
-                "Refresh authentication tokens if applicable"
-            ],
-            ErrorType.SERVER_ERROR: [
-                "Check FleetPulse backend service logs",
-                "Restart backend service if needed",
-                "Verify system resources availability",
-                "Check for recent configuration changes"
-            ]        }
-        return actions_map.get(error_type, ["Check logs for more details", "Contact system administrator"])
-
-    def _register_tools(self) -> Dict[str, MCPTool]:
-        """Register available MCP tools for FleetPulse."""
-        return {
-            "health_check": MCPTool(
-                name="health_check",
-                description="Check backend and MCP server health status",
-                parameters={}
-            ),
-            "list_hosts": MCPTool(
-                name="list_hosts",
-                description="List all hosts with metadata (OS, last update, package count)",
-                parameters={}
-            ),
-            "get_host_details": MCPTool(
-                name="get_host_details",
-                description="Get detailed information about a specific host",
-                parameters={
-                    "hostname": {
-                        "type": "string",
-                        "description": "Name of the host to query",
-                        "required": True
-                    }
-                }
-            ),
-            "get_update_reports": MCPTool(
-                name="get_update_reports",
-                description="Retrieve package update reports with filtering",
-                parameters={
-                    "hostname": {
-                        "type": "string",
-                        "description": "Filter by hostname (optional)",
-                        "required": False
-                    },
-                    "days": {
-                        "type": "integer",
-                        "description": "Number of days to look back (default: 30)",
-                        "required": False,
-                        "default": 30
-                    }
-                }
-            ),
-            "get_host_reports": MCPTool(
-                name="get_host_reports",
-                description="Get update reports for a specific host",
-                parameters={
-                    "hostname": {
-                        "type": "string",
-                        "description": "Name of the host",
-                        "required": True
-                    },
-                    "days": {
-                        "type": "integer",
-                        "description": "Number of days to look back (default: 30)",
-                        "required": False,
-                        "default": 30
-                    }
-                }
-            ),
-            "list_packages": MCPTool(
-                name="list_packages",
-                description="List all packages across the fleet",
-                parameters={
-                    "search": {
-                        "type": "string",
-                        "description": "Search term to filter packages (optional)",
-                        "required": False
-                    }
-                }
-            ),
-            "get_package_details": MCPTool(
-                name="get_package_details",
-                description="Get detailed package information across the fleet",
-                parameters={
-                    "package_name": {
-                        "type": "string",
-                        "description": "Name of the package",
-                        "required": True
-                    }
-                }
-            ),
-            "get_fleet_statistics": MCPTool(
-                name="get_fleet_statistics",
-                description="Get aggregate statistics and activity metrics",
-                parameters={}
-            ),
-            "search": MCPTool(
-                name="search",
-                description="Search across hosts, packages, and reports",
-                parameters={
-                    "query": {
-                        "type": "string",
-                        "description": "Search query",
-                        "required": True
-                    }
-                }
-            )
-        }
-    def get_available_tools(self) -> List[MCPTool]:
-        """Get list of available MCP tools."""
-        return list(self.tools.values())
+        actions = self._RECOVERY_ACTIONS.get(error_type, self._DEFAULT_RECOVERY_ACTIONS)
+        return [action.format(base_url=self.base_url) for action in actions]
+    
+    def get_available_tools(self) -> Tuple[MCPTool, ...]:
+        """Get the available MCP tools."""
+        return _TOOL_LIST
     
     def get_tool(self, tool_name: str) -> Optional[MCPTool]:
         """Get tool definition by name."""
@@ -327,139 +596,205 @@ class FleetPulseMCPClient:
     
     async def execute_tool(self, tool_name: str, parameters: Dict[str, Any]) -> MCPToolResult:
         """Execute an MCP tool with given parameters."""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
-        if tool_name not in self.tools:
+        try:
+            tool = self.tools[tool_name]
+        except KeyError:
             return MCPToolResult(
                 success=False,
                 data=None,
-                error=f"Tool '{tool_name}' not found. Available tools: {', '.join(self.tools.keys())}",
+                error=f"Tool '{tool_name}' not found. Available tools: {_AVAILABLE_TOOLS}",
                 error_type=ErrorType.TOOL_NOT_FOUND,
-                execution_time=time.time() - start_time
+                execution_time=_elapsed_since(start_ns)
             )
         
-        # Perform periodic health checks
-        if (self._last_health_check is None or 
-            time.time() - self._last_health_check > self._health_check_interval):
-            await self._update_diagnostics()
-            self._last_health_check = time.time()
+        parameters = _coerce_parameters(tool, parameters)
+        cache_key = self._result_cache_key(tool_name, parameters)
+        cached = self._cached_result(cache_key)
+        # Shared results are frozen, but their decoded data is not, so each caller gets its own copy
+        if cached is not None:
+            return replace(cached, data=_copy_data(cached.data), execution_time=_elapsed_since(start_ns))
+        if cache_key is None:
+            return await self._execute_uncached(tool, parameters, start_ns, cache_key)
         
+        # Identical calls already in flight share one request
+        task = self._inflight.get(cache_key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._execute_uncached(tool, parameters, start_ns, cache_key))
+            self._inflight[cache_key] = task
+            task.add_done_callback(
+                lambda done: self._inflight.pop(cache_key) if self._inflight.get(cache_key) is done else None
+            )
+        # A caller giving up must not cancel the call for everyone else
+        result = await asyncio.shield(task)
+        return replace(result, data=_copy_data(result.data))
+    
+    async def _execute_uncached(
+        self, tool: MCPTool, parameters: Dict[str, Any], start_ns: int, cache_key: Optional[Hashable]
+    ) -> MCPToolResult:
+        """Run a tool against the backend and cache a successful result under cache_key."""
         try:
-            # Route to appropriate handler using actual FleetPulse API endpoints
-            if tool_name == "health_check":
-                result = await self._call_api_endpoint("GET", "/health")
-            elif tool_name == "list_hosts":
-                result = await self._call_api_endpoint("GET", "/api/hosts")
-            elif tool_name == "get_host_details":
-                hostname = parameters.get("hostname")
-                if not hostname:
-                    return MCPToolResult(
-                        success=False,
-                        data=None,
-                        error="hostname parameter is required",
-                        error_type=ErrorType.VALIDATION_ERROR,
-                        execution_time=time.time() - start_time
-                    )
-                result = await self._call_api_endpoint("GET", f"/api/hosts/{hostname}")
-            elif tool_name == "get_update_reports":
-                params = {}
-                if parameters.get("hostname"):
-                    params["hostname"] = parameters["hostname"]
-                if parameters.get("days"):
-                    params["days"] = parameters["days"]
-                result = await self._call_api_endpoint("GET", "/api/reports", params)
-            elif tool_name == "get_host_reports":
-                hostname = parameters.get("hostname")
-                if not hostname:
-                    return MCPToolResult(
-                        success=False,
-                        data=None,
-                        error="hostname parameter is required",
-                        error_type=ErrorType.VALIDATION_ERROR,
-                        execution_time=time.time() - start_time
-                    )
-                params = {}
-                if parameters.get("days"):
-                    params["days"] = parameters["days"]
-                result = await self._call_api_endpoint("GET", f"/api/hosts/{hostname}/reports", params)
-            elif tool_name == "list_packages":
-                params = {}
-                if parameters.get("search"):
-                    params["search"] = parameters["search"]
-                result = await self._call_api_endpoint("GET", "/api/packages", params)
-            elif tool_name == "get_package_details":
-                package_name = parameters.get("package_name")
-                if not package_name:
-                    return MCPToolResult(
-                        success=False,
-                        data=None,
-                        error="package_name parameter is required",
-                        error_type=ErrorType.VALIDATION_ERROR,
-                        execution_time=time.time() - start_time
-                    )
-                result = await self._call_api_endpoint("GET", f"/api/packages/{package_name}")
-            elif tool_name == "get_fleet_statistics":
-                result = await self._call_api_endpoint("GET", "/api/stats")
-            elif tool_name == "search":
-                query = parameters.get("query")
-                if not query:
-                    return MCPToolResult(
-                        success=False,
-                        data=None,
-                        error="query parameter is required",
-                        error_type=ErrorType.VALIDATION_ERROR,
-                        execution_time=time.time() - start_time
-                    )
-                params = {"q": query}
-                result = await self._call_api_endpoint("GET", "/api/search", params)
-            else:
+            # Validate parameters, then dispatch with the tool's declared parameters
+            error = self._parameter_error(tool, parameters)
+            if error:
                 return MCPToolResult(
                     success=False,
                     data=None,
-                    error=f"Tool '{tool_name}' not implemented",
-                    error_type=ErrorType.TOOL_NOT_FOUND,
-                    execution_time=time.time() - start_time
+                    error=error,
+                    error_type=ErrorType.VALIDATION_ERROR,
+                    execution_time=_elapsed_since(start_ns)
                 )
+            # Refresh diagnostics in the background so no tool call waits on the probes
+            if self._health_check_due():
+                self._health_task = asyncio.ensure_future(self._update_diagnostics())
+            # Only parameters the caller gave are sent; the backend applies its own defaults.
+            # LLM tool calls often pass "" for arguments they leave out, so it counts as unset.
+            route = _ROUTES[tool.name]
+            path = route.format_path(parameters)
+            query = {key: parameters[name] for name, key in route.query if parameters.get(name) not in (None, "")}
+            # Bound the whole call, including waiting for a pooled connection
+            async with asyncio.timeout(self.settings.fleetpulse_tool_timeout):
+                result = await self._call_api_endpoint(route.method, path, query or None)
             
             # Add execution time to successful results
-            result.execution_time = time.time() - start_time
+            result = replace(result, execution_time=_elapsed_since(start_ns))
+            self.diagnostics.performance_metrics.tool_call_times.append(result.execution_time)
             
             # Update last successful call timestamp
             if result.success:
-                self.diagnostics.last_successful_call = str(time.time())
+                self.diagnostics.last_successful_call = time.time()
+                self._store_result(cache_key, result)
+            self._record_outcome(result.success)
             
             return result
         
         except Exception as e:
-            logger.error(f"Error executing tool {tool_name}: {e}")
-            return await self._create_error_result(tool_name, e)
+            logger.error(f"Error executing tool {tool.name}: {e}")
+            self._record_outcome(False)
+            return await self._create_error_result(tool.name, e)
+    
+    def _health_check_due(self) -> bool:
+        """Whether diagnostics are stale and no refresh is still running."""
+        task = self._health_task
+        if task is not None and not task.done() and not task.get_loop().is_closed():
+            return False
+        return (self._last_health_check is None or
+                time.monotonic() - self._last_health_check > self._health_check_interval)
+    
+    def _record_outcome(self, success: bool):
+        """Adapt the diagnostics refresh period to recent backend call outcomes."""
+        if success:
+            self._health_multiplier = max(0, self._health_multiplier - 1)
+        else:
+            self._health_multiplier = min(self._HEALTH_MULTIPLIER_MAX, self._health_multiplier + 1)
+        self._health_check_interval = self._HEALTH_CHECK_BASE * (self._HEALTH_MULTIPLIER_MAX + 1 - self._health_multiplier)
+    
+    def _parameter_error(self, tool: MCPTool, parameters: Dict[str, Any]) -> Optional[str]:
+        """Describe why parameters are invalid for tool, or None if they are valid."""
+        validator = _VALIDATORS.get(tool.name)
+        if validator is not None:
+            try:
+                validator(parameters)
+            except fastjsonschema.JsonSchemaValueException as e:
+                return f"Invalid parameters for {tool.name}: {e.message} ({e.rule} rule)"
+            return None
+        
+        # Without fastjsonschema only required parameters are checked
+        for name, spec in tool.parameters.items():
+            if spec.get("required") and not parameters.get(name):
+                return f"{name} parameter is required"
+        return None
+    
+    def _result_cache_key(self, tool_name: str, parameters: Dict[str, Any]) -> Optional[Hashable]:
+        """Cache key for a tool call, or None when its result must not be cached."""
+        if not _ROUTES[tool_name].cache_ttl:
+            return None
+        key = (tool_name, tuple([parameters.get(name) for name in _PARAM_ORDER[tool_name]]))
+        try:
+            hash(key)
+        except TypeError:  # e.g. list-valued parameters
+            return None
+        return key
+    
+    def _cached_result(self, key: Optional[Hashable]) -> Optional[MCPToolResult]:
+        """Get a cached result that is still fresh."""
+        if key is None:
+            return None
+        entry = self._result_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del self._result_cache[key]
+            return None
+        self._result_cache.move_to_end(key)
+        return result
+    
+    def _store_result(self, key: Optional[Hashable], result: MCPToolResult):
+        """Cache a successful result, evicting the least recently used beyond the size limit."""
+        if key is None:
+            return
+        tool_name = key[0]
+        self._result_cache[key] = (time.monotonic() + _ROUTES[tool_name].cache_ttl, result)
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > self._RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+    
+    def execute_tool_sync(self, tool_name: str, parameters: Dict[str, Any], timeout: float = 30.0) -> MCPToolResult:
+        """Execute a tool from synchronous code.
+        
+        Calls run on one long-lived background loop, so synchronous callers
+        reuse pooled connections and cached results instead of paying for a
+        new event loop and connection per call. They go through a client of
+        their own, whose caches are only ever touched from that loop's thread.
+        """
+        future = asyncio.run_coroutine_threadsafe(self._execute_on_sync_loop(tool_name, parameters), _get_sync_loop())
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+    
+    async def _execute_on_sync_loop(self, tool_name: str, parameters: Dict[str, Any]) -> MCPToolResult:
+        """Execute a tool on the background loop's own client."""
+        if self._sync_client is None:
+            self._sync_client = FleetPulseMCPClient()
+        return await self._sync_client.execute_tool(tool_name, parameters)
     
     async def _call_api_endpoint(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> MCPToolResult:
         """Helper method to call FleetPulse API endpoints."""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                url = f"{self.base_url}{endpoint}"
-                
-                if method.upper() == "GET":
-                    response = await client.get(url, params=params)
-                elif method.upper() == "POST":
-                    response = await client.post(url, json=params)
-                else:
-                    return MCPToolResult(
-                        success=False,
-                        data=None,
-                        error=f"Unsupported HTTP method: {method}"
-                    )
-                
-                response.raise_for_status()
-                
+            client = self._get_shared_http_client()
+            url = f"{self.base_url}{endpoint}"
+            
+            method = method.upper()
+            if method == "GET":
+                response = await client.get(url, params=params)
+            elif method == "POST":
+                response = await client.post(url, content=msgspec.json.encode(params), headers=_JSON_HEADERS)
+            else:
                 return MCPToolResult(
-                    success=True,
-                    data=response.json()
+                    success=False,
+                    data=None,
+                    error=f"Unsupported HTTP method: {method}"
                 )
-                
+            
+            response.raise_for_status()
+            self._last_api_success = time.monotonic()
+            
+            return MCPToolResult(
+                success=True,
+                data=msgspec.json.decode(response.content)
+            )
+            
         except httpx.HTTPStatusError as e:
-            error_type = self._classify_error(e, e.response)
             return await self._create_error_result(endpoint, e, e.response)
         except Exception as e:
-            return await self._create_error_result(endpoint, e)
\ No newline at end of file
+            return await self._create_error_result(endpoint, e)
+
+
+@lru_cache(maxsize=1)
+def get_fleetpulse_mcp_client() -> FleetPulseMCPClient:
+    """Get the process-wide FleetPulse client, so callers share its state and connection pools."""
+    return FleetPulseMCPClient()
@@ -0,0 +1,13 @@
+"""Performance metrics shared by the MCP clients."""
+
+from collections import deque
+from typing import Deque
+
+
+class PerfMetrics:
+    """Fixed-layout performance metrics with a bounded history of tool call timings."""
+    __slots__ = ("health_check_time", "tool_call_times")
+    
+    def __init__(self, max_samples: int = 256):
+        self.health_check_time: float = 0.0
+        self.tool_call_times: Deque[float] = deque(maxlen=max_samples)
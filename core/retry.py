@@ -0,0 +1,114 @@
+"""Retry with exponential backoff for transient GenAI provider errors."""
+
+import asyncio
+import logging
+import random
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Status codes worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUS = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """HTTP status of an SDK or httpx error, if it carries one."""
+    # openai/anthropic use status_code, google.api_core uses code
+    for attr in ("status_code", "code"):
+        status = getattr(error, attr, None)
+        if isinstance(status, int):
+            return status
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether an error is likely to go away if the request is repeated."""
+    if isinstance(error, (asyncio.TimeoutError, httpx.TransportError)):
+        return True
+    # openai and anthropic raise APIConnectionError (and its APITimeoutError
+    # subclass) for transport failures; match by name to avoid importing them
+    if any(cls.__name__ == "APIConnectionError" for cls in type(error).__mro__):
+        return True
+    return _status_code(error) in RETRYABLE_STATUS
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds to wait from a Retry-After header on the error's response."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    value = headers.get("retry-after") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(error: BaseException, attempt: int, base: float, cap: float) -> float:
+    """Delay before the next attempt: Retry-After if given, else full-jitter backoff."""
+    delay = retry_after(error)
+    if delay is None:
+        delay = random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+    return delay
+
+
+async def with_retry(
+    fn: Callable[[], Awaitable[T]],
+    *,
+    attempts: int = 5,
+    base: float = 0.25,
+    cap: float = 8.0,
+    retry_on: Callable[[BaseException], bool] = is_transient,
+) -> T:
+    """Await fn(), retrying transient failures with exponential backoff and jitter."""
+    for attempt in range(1, attempts + 1):
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt >= attempts or not retry_on(e):
+                raise
+            delay = backoff_delay(e, attempt, base, cap)
+            logger.warning(f"Transient error ({e!r}), retrying in {delay:.2f}s (attempt {attempt}/{attempts})")
+            await asyncio.sleep(delay)
+    raise RuntimeError("with_retry needs at least one attempt")
+
+
+async def stream_with_retry(
+    fn: Callable[[], AsyncIterator[T]],
+    *,
+    attempts: int = 5,
+    base: float = 0.25,
+    cap: float = 8.0,
+    retry_on: Callable[[BaseException], bool] = is_transient,
+) -> AsyncIterator[T]:
+    """Iterate fn(), retrying transient failures that happen before the first item.
+
+    Once an item has been yielded the stream cannot be replayed, so later
+    failures are raised to the caller.
+    """
+    for attempt in range(1, attempts + 1):
+        started = False
+        try:
+            async for item in fn():
+                started = True
+                yield item
+            return
+        except Exception as e:
+            if started or attempt >= attempts or not retry_on(e):
+                raise
+            delay = backoff_delay(e, attempt, base, cap)
+            logger.warning(f"Transient error ({e!r}), retrying stream in {delay:.2f}s (attempt {attempt}/{attempts})")
+            await asyncio.sleep(delay)
@@ -1,9 +1,11 @@
 """Test MCP error handling and diagnostic capabilities."""
 
+import json
 import pytest
 import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 import httpx
+import msgspec
 
 from core.mcp_client import FleetPulseMCPClient, MCPToolResult, ErrorType
 from utils.mcp_diagnostics import MCPDiagnosticRunner, DiagnosticResult
@@ -17,13 +19,14 @@ class TestMCPErrorHandling:
         """Create MCP client for testing."""
         with patch('core.mcp_client.get_settings') as mock_settings:
             mock_settings.return_value.fleetpulse_api_url = "http://localhost:8000"
+            mock_settings.return_value.fleetpulse_tool_timeout = 30.0
             return FleetPulseMCPClient()
     
     @pytest.mark.asyncio
     async def test_network_error_handling(self, mcp_client):
         """Test network error classification and response."""
         with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.get.side_effect = httpx.ConnectError("Connection refused")
+            mock_client.return_value.get.side_effect = httpx.ConnectError("Connection refused")
             
             result = await mcp_client.execute_tool("get_fleet_status", {})
             
@@ -37,7 +40,7 @@ class TestMCPErrorHandling:
     async def test_timeout_error_handling(self, mcp_client):
         """Test timeout error classification and response."""
         with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.get.side_effect = httpx.TimeoutException("Request timed out")
+            mock_client.return_value.get.side_effect = httpx.TimeoutException("Request timed out")
             
             result = await mcp_client.execute_tool("get_update_history", {"hostname": "test-host"})
             assert not result.success
@@ -45,6 +48,22 @@ class TestMCPErrorHandling:
             assert "timed out" in result.error
             assert result.diagnostics
     
+    @pytest.mark.asyncio
+    async def test_tool_deadline_exceeded(self, mcp_client):
+        """Test that a tool call exceeding its overall deadline reports a timeout."""
+        mcp_client.settings.fleetpulse_tool_timeout = 0.05
+        
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(10)
+        
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_client.return_value.get = AsyncMock(side_effect=hang)
+            
+            result = await mcp_client.execute_tool("list_hosts", {})
+            
+            assert not result.success
+            assert result.error_type == ErrorType.TIMEOUT_ERROR
+    
     @pytest.mark.asyncio
     async def test_authentication_error_handling(self, mcp_client):
         """Test authentication error classification."""
@@ -52,7 +71,7 @@ class TestMCPErrorHandling:
             mock_response = MagicMock()
             mock_response.status_code = 401
             mock_response.raise_for_status.side_effect = httpx.HTTPStatusError("Unauthorized", request=None, response=mock_response)
-            mock_client.return_value.__aenter__.return_value.get.return_value = mock_response
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
             
             result = await mcp_client.execute_tool("get_host_details", {"hostname": "test-host"})
             
@@ -65,7 +84,7 @@ class TestMCPErrorHandling:
         """Test database error detection and handling."""
         with patch('httpx.AsyncClient') as mock_client:
             # Simulate database-related error
-            mock_client.return_value.__aenter__.return_value.get.side_effect = Exception("SQLite database is locked")
+            mock_client.return_value.get.side_effect = Exception("SQLite database is locked")
             
             result = await mcp_client.execute_tool("get_update_history", {"hostname": "test-host"})
             
@@ -99,13 +118,26 @@ class TestMCPErrorHandling:
         
         # Simulate multiple errors
         with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.get.side_effect = httpx.ConnectError("Connection refused")
+            mock_client.return_value.get.side_effect = httpx.ConnectError("Connection refused")
             
             await mcp_client.execute_tool("get_fleet_status", {})
             await mcp_client.execute_tool("get_host_details", {"hostname": "test"})
         
         assert mcp_client._error_count > initial_count
     
+    @pytest.mark.asyncio
+    async def test_health_check_interval_adapts(self, mcp_client):
+        """Test that failing calls shorten the diagnostics refresh period."""
+        stable_interval = mcp_client._health_check_interval
+        
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_client.return_value.get = AsyncMock(side_effect=httpx.ConnectError("Connection refused"))
+            
+            await mcp_client.execute_tool("list_hosts", {})
+            await mcp_client.execute_tool("get_fleet_statistics", {})
+        
+        assert mcp_client._health_check_interval < stable_interval
+    
     @pytest.mark.asyncio
     async def test_diagnostics_update(self, mcp_client):
         """Test that diagnostics are properly updated."""
@@ -116,6 +148,23 @@ class TestMCPErrorHandling:
         assert hasattr(diagnostics, 'error_count')
         assert hasattr(diagnostics, 'network_connectivity')
 
+    @pytest.mark.asyncio
+    async def test_database_probe_skipped_after_recent_success(self, mcp_client):
+        """Test that a recent successful API call stands in for the database probe."""
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.content = json.dumps([]).encode()
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
+
+            result = await mcp_client._call_api_endpoint("GET", "/api/hosts")
+            assert result.success
+            calls_before = mock_client.return_value.get.call_count
+
+            await mcp_client._test_database_connectivity()
+
+            assert mock_client.return_value.get.call_count == calls_before
+
 
 class TestMCPDiagnostics:
     """Test MCP diagnostic capabilities."""
@@ -274,8 +323,14 @@ class TestDiagnosticReporting:
             connect_error = client._classify_error(httpx.ConnectError("connection failed"))
             assert connect_error == ErrorType.NETWORK_ERROR
             
+            transport_error = client._classify_error(httpx.TransportError("connection reset"))
+            assert transport_error == ErrorType.NETWORK_ERROR
+            
             database_error = client._classify_error(Exception("SQLite database locked"))
             assert database_error == ErrorType.DATABASE_ERROR
+            
+            decode_error = client._classify_error(msgspec.DecodeError("JSON is malformed"))
+            assert decode_error == ErrorType.SERVER_ERROR
 
 
 if __name__ == "__main__":
@@ -3,7 +3,10 @@
 import pytest
 import asyncio
 from unittest.mock import Mock, patch, AsyncMock
-from core.genai_manager import GenAIManager, ChatMessage, OpenAIProvider
+import httpx
+from core.genai_manager import GenAIManager, ChatMessage, OpenAIProvider, _CircuitBreaker
+from core.llm_cache import LLMCache, MemoryCacheBackend, build_cache_key, compile_exclude_patterns
+from core.retry import with_retry
 
 
 @pytest.fixture
@@ -67,21 +70,20 @@ class TestOpenAIProvider:
     @pytest.fixture
     def openai_provider(self):
         """Create OpenAI provider for testing."""
-        with patch('semantic_kernel.Kernel'), \
-             patch('semantic_kernel.connectors.ai.open_ai.OpenAIChatCompletion'):
-            return OpenAIProvider("test-key")
+        return OpenAIProvider("test-key")
     
     @pytest.mark.asyncio
     async def test_chat_completion(self, openai_provider):
         """Test OpenAI chat completion."""
         messages = [ChatMessage(role="user", content="Hello")]
         
-        # Mock the chat service response
-        with patch.object(openai_provider, 'chat_service') as mock_service:
-            mock_response = Mock()
-            mock_response.content = "Hello there!"
-            mock_service.get_chat_message_content = AsyncMock(return_value=mock_response)
-            
+        # Mock the async client response
+        mock_client = Mock()
+        mock_response = Mock()
+        mock_response.choices = [Mock(message=Mock(content="Hello there!"))]
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+        
+        with patch.object(openai_provider, '_new_client', return_value=mock_client):
             response = await openai_provider.chat_completion(messages)
             assert response == "Hello there!"
     
@@ -95,12 +97,13 @@ class TestOpenAIProvider:
             chunks = ["Hello", " there", "!"]
             for chunk in chunks:
                 mock_chunk = Mock()
-                mock_chunk.content = chunk
+                mock_chunk.choices = [Mock(delta=Mock(content=chunk))]
                 yield mock_chunk
         
-        with patch.object(openai_provider, 'chat_service') as mock_service:
-            mock_service.get_streaming_chat_message_content = mock_stream
-            
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_stream())
+        
+        with patch.object(openai_provider, '_new_client', return_value=mock_client):
             result = []
             async for chunk in openai_provider.stream_completion(messages):
                 result.append(chunk)
@@ -108,15 +111,134 @@ class TestOpenAIProvider:
             assert "".join(result) == "Hello there!"
 
 
+class TestLLMCache:
+    """Test the chat completion response cache."""
+    
+    @pytest.mark.asyncio
+    async def test_exact_hit_skips_provider(self):
+        """Test that a repeated deterministic request is answered from the cache."""
+        cache = LLMCache(MemoryCacheBackend())
+        messages = [ChatMessage(role="user", content="How many hosts?")]
+        compute = AsyncMock(return_value="42 hosts")
+        key = build_cache_key("openai", messages, {"temperature": 0})
+        
+        assert await cache.get_or_compute(key, compute) == "42 hosts"
+        assert await cache.get_or_compute(key, compute) == "42 hosts"
+        assert compute.await_count == 1
+        assert cache.stats["exact_hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_semantic_hit(self):
+        """Test that a paraphrased question reuses the earlier answer."""
+        vectors = {"How many hosts?": [1.0, 0.0], "How many hosts are there?": [0.99, 0.05]}
+        cache = LLMCache(MemoryCacheBackend(), embed=AsyncMock(side_effect=vectors.get))
+        compute = AsyncMock(return_value="42 hosts")
+        
+        for question in vectors:
+            key = build_cache_key("openai", [ChatMessage(role="user", content=question)], {"temperature": 0})
+            assert await cache.get_or_compute(key, compute) == "42 hosts"
+        
+        assert compute.await_count == 1
+        assert cache.stats["semantic_hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_semantic_entries_expire_with_ttl(self):
+        """Test that the semantic layer stops answering once the cache TTL has passed."""
+        vectors = {"How many hosts?": [1.0, 0.0], "How many hosts are there?": [0.99, 0.05]}
+        cache = LLMCache(MemoryCacheBackend(ttl=60.0), embed=AsyncMock(side_effect=vectors.get))
+        compute = AsyncMock(return_value="42 hosts")
+        questions = iter(vectors)
+        
+        with patch('core.llm_cache.time.monotonic', return_value=1000.0):
+            key = build_cache_key("openai", [ChatMessage(role="user", content=next(questions))], {"temperature": 0})
+            await cache.get_or_compute(key, compute)
+        with patch('core.llm_cache.time.monotonic', return_value=1061.0):
+            key = build_cache_key("openai", [ChatMessage(role="user", content=next(questions))], {"temperature": 0})
+            await cache.get_or_compute(key, compute)
+        
+        assert compute.await_count == 2
+        assert cache.stats["semantic_hits"] == 0
+    
+    def test_sampled_requests_not_cached(self):
+        """Test that requests with a non-zero temperature bypass the cache."""
+        messages = [ChatMessage(role="user", content="Hello")]
+        assert build_cache_key("openai", messages, {"temperature": 0.7}) is None
+        assert build_cache_key("openai", messages, {}) is None
+    
+    def test_tool_and_time_sensitive_requests_not_cached(self):
+        """Test that tool calls and excluded questions bypass the cache."""
+        exclude = compile_exclude_patterns([r"\btoday\b"])
+        params = {"temperature": 0}
+        
+        assert build_cache_key("openai", [ChatMessage(role="user", content="Hosts?")], {**params, "tools": ["x"]}) is None
+        assert build_cache_key("openai", [ChatMessage(role="user", content="Updates TODAY?")], params, exclude) is None
+        assert build_cache_key("openai", [ChatMessage(role="user", content="Hosts?")], params, exclude) is not None
+
+
+class TestRetry:
+    """Test retrying transient provider errors."""
+    
+    @pytest.mark.asyncio
+    async def test_rate_limit_retried_with_retry_after(self):
+        """Test that a 429 is retried after the server's Retry-After delay."""
+        request = httpx.Request("POST", "http://localhost:11434/api/chat")
+        response = httpx.Response(429, headers={"Retry-After": "2"}, request=request)
+        fn = AsyncMock(side_effect=[httpx.HTTPStatusError("Too many requests", request=request, response=response), "ok"])
+        
+        with patch('core.retry.asyncio.sleep', new=AsyncMock()) as mock_sleep:
+            assert await with_retry(fn) == "ok"
+        
+        assert fn.await_count == 2
+        mock_sleep.assert_awaited_once_with(2.0)
+    
+    @pytest.mark.asyncio
+    async def test_permanent_error_not_retried(self):
+        """Test that non-transient errors are raised immediately."""
+        fn = AsyncMock(side_effect=ValueError("bad request"))
+        
+        with pytest.raises(ValueError):
+            await with_retry(fn)
+        assert fn.await_count == 1
+
+
+
+class TestCircuitBreaker:
+    """Test the per-provider circuit breaker."""
+    
+    def test_permanent_errors_do_not_open(self):
+        """Test that only transient failures count towards opening the breaker."""
+        breaker = _CircuitBreaker(threshold=2, cooldown=60.0)
+        breaker.record_failure(0.1, transient=False)
+        breaker.record_failure(0.1, transient=False)
+        assert breaker.allow()
+        
+        breaker.record_failure(0.1)
+        breaker.record_failure(0.1)
+        assert not breaker.allow()
+        assert breaker.stats()["failures"] == 4
+    
+    def test_half_open_allows_single_trial(self):
+        """Test that a half-open breaker lets exactly one request through."""
+        breaker = _CircuitBreaker(threshold=1, cooldown=0.0)
+        breaker.record_failure(0.1)
+        
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.end_trial()
+        breaker.record_success(0.1)
+        assert breaker.allow()
+        assert breaker.allow()
+
 @pytest.mark.asyncio
 async def test_error_handling():
     """Test error handling in providers."""
     provider = OpenAIProvider("test-key")
     messages = [ChatMessage(role="user", content="Test")]
     
-    with patch.object(provider, 'chat_service') as mock_service:
-        mock_service.get_chat_message_content = AsyncMock(side_effect=Exception("API Error"))
-        
+    mock_client = Mock()
+    mock_client.chat.completions.create = AsyncMock(side_effect=Exception("API Error"))
+    
+    with patch.object(provider, '_new_client', return_value=mock_client):
         with pytest.raises(Exception, match="API Error"):
             await provider.chat_completion(messages)
 
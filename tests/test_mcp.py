@@ -1,5 +1,7 @@
 """Tests for MCP Client functionality."""
 
+import asyncio
+import json
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 import httpx
@@ -11,9 +13,15 @@ def mcp_client():
     """Create MCP client for testing."""
     with patch('core.mcp_client.get_settings') as mock_settings:
         mock_settings.return_value.fleetpulse_api_url = "http://test-api:8000"
+        mock_settings.return_value.fleetpulse_tool_timeout = 30.0
         return FleetPulseMCPClient()
 
 
+def _calls_to(mock_get, endpoint):
+    """Count mocked GET requests to an endpoint, ignoring background health probes."""
+    return sum(1 for call in mock_get.call_args_list if call.args[0].endswith(endpoint))
+
+
 class TestMCPTool:
     """Test MCP tool dataclass."""
     
@@ -95,6 +103,14 @@ class TestFleetPulseMCPClient:
         assert result.success is False
         assert "not found" in result.error.lower()
     
+    def test_execute_tool_sync(self, mcp_client):
+        """Test executing a tool from synchronous code."""
+        result = mcp_client.execute_tool_sync("unknown_tool", {})
+        assert result.success is False
+        assert "not found" in result.error.lower()
+        assert mcp_client._sync_client is not None
+        assert mcp_client._sync_client._inflight is not mcp_client._inflight
+    
     @pytest.mark.asyncio 
     async def test_list_hosts_success(self, mcp_client):
         """Test successful hosts listing."""
@@ -107,10 +123,10 @@ class TestFleetPulseMCPClient:
         
         with patch('httpx.AsyncClient') as mock_client:
             mock_response = Mock()
-            mock_response.json.return_value = mock_response_data
+            mock_response.content = json.dumps(mock_response_data).encode()
             mock_response.raise_for_status.return_value = None
             
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
             
             result = await mcp_client.execute_tool("list_hosts", {})
             
@@ -122,7 +138,7 @@ class TestFleetPulseMCPClient:
     async def test_list_hosts_error(self, mcp_client):
         """Test hosts listing with error."""
         with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(
+            mock_client.return_value.get = AsyncMock(
                 side_effect=httpx.RequestError("Connection failed")
             )
             
@@ -143,10 +159,10 @@ class TestFleetPulseMCPClient:
         
         with patch('httpx.AsyncClient') as mock_client:
             mock_response = Mock()
-            mock_response.json.return_value = mock_response_data
+            mock_response.content = json.dumps(mock_response_data).encode()
             mock_response.raise_for_status.return_value = None
             
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
             
             result = await mcp_client.execute_tool("get_host_details", {"hostname": hostname})
             
@@ -161,6 +177,51 @@ class TestFleetPulseMCPClient:
         assert result.success is False
         assert "hostname is required" in result.error.lower()
     
+    @pytest.mark.asyncio
+    async def test_invalid_parameter_type(self, mcp_client):
+        """Test that parameters of the wrong type are rejected before any request."""
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_client.return_value.get = AsyncMock()
+            
+            result = await mcp_client.execute_tool("get_host_reports", {"hostname": "server01", "days": "many"})
+            
+            assert result.success is False
+            assert "days" in result.error
+            assert _calls_to(mock_client.return_value.get, "/reports") == 0
+    
+    @pytest.mark.asyncio
+    async def test_lenient_optional_parameters(self, mcp_client):
+        """Test that numeric strings are coerced and null optional parameters accepted."""
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_response = Mock()
+            mock_response.content = json.dumps({"reports": []}).encode()
+            mock_response.raise_for_status.return_value = None
+            
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
+            
+            coerced = await mcp_client.execute_tool("get_host_reports", {"hostname": "server01", "days": "7"})
+            omitted = await mcp_client.execute_tool("get_update_reports", {"days": None})
+            
+            assert coerced.success is True
+            assert omitted.success is True
+            mock_client.return_value.get.assert_any_call("http://test-api:8000/api/hosts/server01/reports", params={"days": 7})
+    
+    @pytest.mark.asyncio
+    async def test_only_given_parameters_are_sent(self, mcp_client):
+        """Test that defaults and empty strings are not sent, while 0 is kept."""
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_response = Mock()
+            mock_response.content = json.dumps({"reports": []}).encode()
+            mock_response.raise_for_status.return_value = None
+            
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
+            
+            await mcp_client.execute_tool("get_update_reports", {"hostname": ""})
+            await mcp_client.execute_tool("get_host_reports", {"hostname": "server01", "days": 0})
+            
+            mock_client.return_value.get.assert_any_call("http://test-api:8000/api/reports", params=None)
+            mock_client.return_value.get.assert_any_call("http://test-api:8000/api/hosts/server01/reports", params={"days": 0})
+    
     @pytest.mark.asyncio
     async def test_get_host_details_not_found(self, mcp_client):
         """Test host details retrieval for non-existent host."""
@@ -169,13 +230,65 @@ class TestFleetPulseMCPClient:
             mock_response.status_code = 404
             
             error = httpx.HTTPStatusError("Not found", request=Mock(), response=mock_response)
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(side_effect=error)
+            mock_client.return_value.get = AsyncMock(side_effect=error)
             
             result = await mcp_client.execute_tool("get_host_details", {"hostname": "nonexistent"})
             
             assert result.success is False
             assert "not found" in result.error.lower()
     
+    @pytest.mark.asyncio
+    async def test_repeated_tool_call_is_cached(self, mcp_client):
+        """Test that a repeated read tool call reuses the earlier result."""
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_response = Mock()
+            mock_response.content = json.dumps({"hosts": []}).encode()
+            mock_response.raise_for_status.return_value = None
+            
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
+            
+            first = await mcp_client.execute_tool("list_hosts", {})
+            first.data["hosts"].append("changed by caller")
+            second = await mcp_client.execute_tool("list_hosts", {})
+            
+            assert second.success is True
+            assert second.data == {"hosts": []}
+            assert _calls_to(mock_client.return_value.get, "/api/hosts") == 1
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_calls_are_coalesced(self, mcp_client):
+        """Test that identical tool calls in flight share one request."""
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_response = Mock()
+            mock_response.content = json.dumps({"hosts": []}).encode()
+            mock_response.raise_for_status.return_value = None
+            
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
+            
+            results = await asyncio.gather(*(mcp_client.execute_tool("list_hosts", {}) for _ in range(3)))
+            
+            assert all(result.success for result in results)
+            assert _calls_to(mock_client.return_value.get, "/api/hosts") == 1
+    
+    @pytest.mark.asyncio
+    async def test_aclose_finishes_health_refresh(self, mcp_client):
+        """Test that closing the client waits for the background diagnostics refresh."""
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_response = Mock()
+            mock_response.content = json.dumps({"hosts": []}).encode()
+            mock_response.raise_for_status.return_value = None
+            
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.aclose = AsyncMock()
+            
+            await mcp_client.execute_tool("list_hosts", {})
+            await mcp_client.aclose()
+            
+            assert mcp_client._health_task.done()
+            assert mcp_client._last_health_check is not None
+            assert mcp_client.diagnostics.backend_status == "healthy"
+            mock_client.return_value.aclose.assert_awaited_once()
+    
     @pytest.mark.asyncio
     async def test_schedule_updates_success(self, mcp_client):
         """Test successful update scheduling."""
@@ -189,10 +302,10 @@ class TestFleetPulseMCPClient:
         
         with patch('httpx.AsyncClient') as mock_client:
             mock_response = Mock()
-            mock_response.json.return_value = mock_response_data
+            mock_response.content = json.dumps(mock_response_data).encode()
             mock_response.raise_for_status.return_value = None
             
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(return_value=mock_response)
+            mock_client.return_value.post = AsyncMock(return_value=mock_response)
             
             result = await mcp_client.execute_tool("schedule_updates", params)
             
@@ -220,7 +333,7 @@ async def test_generic_http_error_handling():
     
     with patch('httpx.AsyncClient') as mock_client:
         # Simulate network error
-        mock_client.return_value.__aenter__.return_value.get = AsyncMock(
+        mock_client.return_value.get = AsyncMock(
             side_effect=httpx.ConnectError("Network unreachable")
         )
         
@@ -7,6 +7,7 @@ from datetime import datetime
 import asyncio
 
 from core.genai_manager import ChatMessage
+from core.fastmcp_client import close_shared_http_client
 from core.mcp_client import MCPTool, MCPToolResult, ErrorType
 from core.expert_router import ExpertRouter, ExpertMatch, ExpertType
 from config.prompts import get_prompt_descriptions
@@ -641,6 +642,7 @@ def render_tool_status_indicator(mcp_client):
         try:
             diagnostics = loop.run_until_complete(mcp_client.get_diagnostics())
         finally:
+            loop.run_until_complete(close_shared_http_client())
             loop.close()
         
         # Display status indicator
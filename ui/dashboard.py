@@ -8,14 +8,14 @@ import plotly.graph_objects as go
 import pandas as pd
 from datetime import datetime, timedelta
 
-from core.mcp_client import FleetPulseMCPClient
+from core.mcp_client import get_fleetpulse_mcp_client
 
 
 class FleetDashboard:
     """Fleet dashboard for visualizing FleetPulse data."""
     
     def __init__(self):
-        self.mcp_client = FleetPulseMCPClient()
+        self.mcp_client = get_fleetpulse_mcp_client()
     
     async def render_overview_dashboard(self):
         """Render the main fleet overview dashboard."""
@@ -389,10 +389,11 @@ class FleetDashboard:
 # Utility function to run async dashboard functions
 def run_dashboard_async(dashboard_func, *args):
     """Run async dashboard function in Streamlit."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
     try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    
-    return loop.run_until_complete(dashboard_func(*args))
\ No newline at end of file
+        return loop.run_until_complete(dashboard_func(*args))
+    finally:
+        # Release the MCP client's pooled connections before the loop goes away
+        loop.run_until_complete(get_fleetpulse_mcp_client().aclose())
+        loop.close()
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""Event loop policy helpers."""
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+_uvloop_installed = False
+
+
+def install_uvloop() -> bool:
+    """Use uvloop for event loops created from now on, if it is available.
+
+    The app creates a fresh loop per operation, so installing the policy once
+    makes every later ``asyncio.new_event_loop()`` a uvloop loop. The loop that
+    is already running is not affected.
+    """
+    global _uvloop_installed
+
+    if _uvloop_installed:
+        return True
+
+    try:
+        import uvloop
+    except ImportError:
+        logger.debug("uvloop not installed, using the default asyncio event loop")
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    _uvloop_installed = True
+    logger.info("Installed uvloop event loop policy")
+    return True